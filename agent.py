@@ -1,3 +1,5 @@
+import re
+
 from pydantic import BaseModel
 from agents import Agent, WebSearchTool
 from agents.model_settings import ModelSettings
@@ -179,6 +181,12 @@ orchestrator_agent = Agent(
     output_type=FinalTour,
 )
 
+# Plain-text variant of the orchestrator so the tour can be streamed token by token
+orchestrator_stream_agent = orchestrator_agent.clone(
+    name="OrchestratorStreamAgent",
+    output_type=None,
+)
+
 PLANNER_INSTRUCTIONS = ("""
 Your Role
 You are the Planner Agent for a self-guided tour system. Your primary responsibility is to analyze the user's location, interests, and requested tour duration to create an optimal time allocation plan.
@@ -218,4 +226,109 @@ planner_agent = Agent(
     instructions=PLANNER_INSTRUCTIONS,
     model="gpt-4o",
     output_type=Planner,
-)
\ No newline at end of file
+)
+
+CONTINUATION_INSTRUCTIONS = ("""
+You are the Continuation agent for a self-guided audio tour system. You are given one section of an existing tour script and a number of extra words. Your role is to:
+1. Write only the new text that continues the section, picking up naturally where it ends
+2. Add fresh details about the same topic and location; never repeat facts already in the section
+3. Match the voice and style of the existing section
+4. Make sure the details are conversational and don't include any formatting or headings. It will be directly used in a audio model for converting to speech and the entire content should feel like natural speech.
+5. Make sure the new text is close to the requested number of extra words
+
+NOTE: Do not add any Links or Hyperlinks in your answer or never cite any source
+""")
+
+class Continuation(BaseModel):
+    output: str
+
+continuation_agent = Agent(
+    name="ContinuationAgent",
+    instructions=CONTINUATION_INSTRUCTIONS,
+    model="gpt-4o-mini",
+    output_type=Continuation,
+)
+
+TRANSITIONS_INSTRUCTIONS = ("""
+You are the Transitions agent for a self-guided audio tour system. The body of the tour is already written by specialist agents and will be read out verbatim. You are given the location, the selected interests and the opening and closing sentence of each section in order. Your role is to:
+1. Write a warm, welcoming introduction that names the location and briefly outlines what the tour will cover
+2. Write one short transition for each section, in the given order, that leads the listener into that section; the first one follows the introduction and every other one follows the closing sentence of the previous section
+3. Write a thoughtful concise conclusion that reinforces the uniqueness of the location and encourages further exploration
+4. Never repeat facts from the sections; only connect them
+5. Make sure the details are conversational and don't include any formatting or headings. It will be directly used in a audio model for converting to speech and the entire content should feel like natural speech.
+6. Keep the introduction, each transition and the conclusion close to their word limits
+
+NOTE: Do not add any Links or Hyperlinks in your answer or never cite any source
+""")
+
+class TourLinks(BaseModel):
+    introduction: str
+    transitions: list[str]
+    """One lead-in per section, in section order"""
+    conclusion: str
+
+transitions_agent = Agent(
+    name="TransitionsAgent",
+    instructions=TRANSITIONS_INSTRUCTIONS,
+    model="gpt-4o-mini",
+    output_type=TourLinks,
+)
+
+SEARCH_AGENT_INSTRUCTIONS = ("""
+You are the Search agent for a self-guided audio tour system. Given a location, your role is to:
+1. Use web search to gather up-to-date facts about the location across its architecture, history, culture and food
+2. Write them up as compact research notes that several specialist writers will share, grouped by topic
+3. Prefer concrete, verifiable details: names, dates, places, dishes, customs and current visitor information
+4. Include each fact only once
+
+NOTE: Do not add any Links or Hyperlinks in your answer or never cite any source
+""")
+
+class LocationBrief(BaseModel):
+    output: str
+
+search_agent = Agent(
+    name="SearchAgent",
+    instructions=SEARCH_AGENT_INSTRUCTIONS,
+    model="gpt-4o-mini",
+    tools=[WebSearchTool()],
+    model_settings=ModelSettings(tool_choice="required"),
+    output_type=LocationBrief,
+)
+
+BRIEFED_NOTE = "NOTE: Use the research notes given with the request as your source of up-to-date facts about the location"
+
+
+def _briefed(agent: Agent) -> Agent:
+    # Specialist variant that writes from the shared search briefing instead of searching itself
+    return agent.clone(
+        name=agent.name.replace("Agent", "BriefedAgent"),
+        instructions=re.sub(r"NOTE: Given a location, use web search[^\n]*", BRIEFED_NOTE, agent.instructions),
+        tools=[],
+        model_settings=ModelSettings(),
+    )
+
+
+architecture_briefed_agent = _briefed(architecture_agent)
+culinary_briefed_agent = _briefed(culinary_agent)
+culture_briefed_agent = _briefed(culture_agent)
+historical_briefed_agent = _briefed(historical_agent)
+
+TRANSLATION_INSTRUCTIONS = ("""
+You are the Translation agent for a self-guided audio tour system. You are given one passage of a finished tour script and a target language. Your role is to:
+1. Translate the passage faithfully into the target language, keeping every fact and the order of ideas
+2. Keep the warm, conversational tone of a guide speaking to a visitor
+3. Keep names of places, people and dishes recognisable; add the local form where it is commonly used
+4. Make sure the details are conversational and don't include any formatting or headings. It will be directly used in a audio model for converting to speech and the entire content should feel like natural speech.
+5. Return only the translated passage
+""")
+
+class Translation(BaseModel):
+    output: str
+
+translation_agent = Agent(
+    name="TranslationAgent",
+    instructions=TRANSLATION_INSTRUCTIONS,
+    model="gpt-4o-mini",
+    output_type=Translation,
+)
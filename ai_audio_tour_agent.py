@@ -1,37 +1,190 @@
 import streamlit as st
 import asyncio
-from manager import TourManager
-from agents import set_default_openai_key
-import tempfile
 import os
-import openai
-
-# ---------- Audio (TTS) ----------
-def tts(text, api_key, language="en"):
-    try:
-        client = openai.OpenAI(api_key=api_key)
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-            speech_file_path = tmp_file.name
-
-        # Pass language hint to the TTS model
-        response = client.audio.speech.create(
-            model="tts-1",
-            voice="nova",
-            input=f"Language: {language}. {text}",
+import queue
+import time
+from ui_profiler import PROFILE_UI, get_rerun_profiler
+
+rerun_timer = get_rerun_profiler().start()
+
+# Only light modules load with the page; the Agents SDK, OpenAI client and TTS are imported
+# inside the functions below the first time a tour is generated
+from interests import ui_labels
+from metrics import collect_metrics
+from localization import LANGUAGE_NAMES, language_name
+from locations import resolve_location
+from research_cache import ResearchCache, SearchCache, SessionResearch, TranslationCache
+from audio_cache import AudioStore
+from audio_profiles import AUDIO_PROFILES, DEFAULT_AUDIO_PROFILE, mime_type_for
+from audio_server import get_audio_server
+from jobs import DONE, FAILED, JobStore
+from backends import is_offline
+
+rerun_timer.mark("imports")
+
+# ---------- Streaming pipeline ----------
+async def generate_tour_audio(mgr, location, interests, duration, plan_mode, api_key, language, store, audio_profile, on_paragraph):
+    # Paragraphs go to TTS as soon as the orchestrator finishes them
+    from tts import TTSPipeline
+
+    paragraphs = []
+    # The tour is read in its own task so a failed TTS chunk cannot cut the text short
+    written = asyncio.Queue()
+
+    async def read_tour():
+        try:
+            async for paragraph in mgr.stream(location, interests, duration, plan_mode=plan_mode, language=language):
+                paragraphs.append(paragraph)
+                on_paragraph(paragraph)
+                written.put_nowait(paragraph)
+        finally:
+            written.put_nowait(None)
+
+    async def tour_paragraphs():
+        while (paragraph := await written.get()) is not None:
+            yield paragraph
+
+    with collect_metrics() as metrics:
+        reader = asyncio.create_task(read_tour())
+        try:
+            pipeline = TTSPipeline(api_key, store=store, profile=audio_profile)
+            try:
+                segments = [segment async for segment in pipeline.stream_paragraphs(tour_paragraphs(), language)]
+            except Exception:
+                # Keep the text; show_tour reports the missing audio
+                segments = []
+            # Errors writing the tour itself still fail the whole generation
+            await reader
+        finally:
+            reader.cancel()
+    # Writing and re-encoding the file blocks; keep it off the loop every session shares
+    audio_path = await asyncio.to_thread(store.assemble, segments, pipeline.profile) if segments else None
+    return "\n\n".join(paragraphs), audio_path, metrics
+
+# ---------- Research cache ----------
+@st.cache_resource
+def get_research_cache():
+    # One SQLite-backed cache per server process, shared by every session
+    return ResearchCache()
+
+@st.cache_resource
+def get_search_cache():
+    # Shared web search briefings, refreshed daily
+    return SearchCache()
+
+@st.cache_resource
+def get_translation_cache():
+    # Translated passages per (passage hash, language); one research pass serves every language
+    return TranslationCache()
+
+@st.cache_resource
+def get_audio_store():
+    # Content-addressed audio segments and assembled tours, shared by every session
+    return AudioStore()
+
+# ---------- Agents ----------
+@st.cache_resource
+def use_openai_key(api_key):
+    # Once per key per process rather than on every rerun
+    from agents import set_default_openai_key
+
+    set_default_openai_key(api_key)
+
+def get_tour_manager(api_key, assembly_mode, prefetch_search):
+    # Reused across reruns of this session; a new one is built only when its settings change.
+    # It holds this user's SessionResearch, so it is kept per session rather than per process.
+    from manager import TourManager
+    from printer import NullPrinter
+
+    settings = (api_key, assembly_mode, prefetch_search)
+    if st.session_state.get("manager_settings") != settings:
+        st.session_state["manager"] = TourManager(
+            cache=get_research_cache(),
+            api_key=api_key,
+            printer=NullPrinter(),
+            assembly_mode=assembly_mode,
+            session=st.session_state["research"],
+            prefetch_search=prefetch_search,
+            search_cache=get_search_cache(),
+            translation_cache=get_translation_cache(),
         )
-        response.stream_to_file(speech_file_path)
-        return speech_file_path
-    except Exception as e:
-        st.error(f"Error generating audio: {e}")
-        return None
+        st.session_state["manager_settings"] = settings
+    return st.session_state["manager"]
+
+# ---------- Job queue ----------
+# With SONICGUIDE_JOB_DB set, tours are handed to separate worker processes (python jobs.py)
+@st.cache_resource
+def get_job_store():
+    return JobStore(os.environ["SONICGUIDE_JOB_DB"]) if os.environ.get("SONICGUIDE_JOB_DB") else None
+
+def show_tour(tour_text, audio_file, metrics, location):
+    st.markdown("<div class='custom-card'><h3>📝 Tour Preview</h3>", unsafe_allow_html=True)
+    st.text_area("", tour_text, height=300, label_visibility="collapsed")
+    st.markdown("</div>", unsafe_allow_html=True)
+    if audio_file and os.path.exists(audio_file):
+        st.success("Audio generated")
+        mime = mime_type_for(audio_file)
+        extension = os.path.splitext(audio_file)[1]
+        file_name = f"sonicguide_{location.lower().replace(' ', '_')}_tour{extension}"
+        server = get_audio_server(get_audio_store())
+        if server is not None:
+            # The browser fetches byte ranges straight from the audio store; nothing is buffered in this session
+            st.audio(server.url_for(audio_file), format=mime)
+            st.link_button(
+                f"💾 Download Audio ({extension.lstrip('.').upper()})",
+                server.url_for(audio_file, file_name),
+                use_container_width=True
+            )
+        else:
+            # Read once and hand the same bytes to the player and the download button
+            with open(audio_file, "rb") as f:
+                audio_bytes = f.read()
+            st.audio(audio_bytes, format=mime)
+            st.download_button(
+                f"💾 Download Audio ({extension.lstrip('.').upper()})",
+                audio_bytes,
+                file_name=file_name,
+                mime=mime,
+                use_container_width=True
+            )
+    else:
+        st.error("Audio generation failed. Please check your API key and try again.")
+    if metrics:
+        with st.expander("⏱️ Generation metrics"):
+            st.json(metrics)
+
+def poll_job(job_store, job_id):
+    # The job id lives in the URL, so a browser refresh picks the same job back up
+    job = job_store.status(job_id)
+    if job is None:
+        st.error("This tour job no longer exists.")
+        del st.query_params["job"]
+    elif job.status == DONE:
+        show_tour(job.result_text, job.audio_path, job.metrics, job.request["location"])
+    elif job.status == FAILED:
+        st.error(f"Error generating tour: {job.error}")
+    else:
+        request = job.request
+        st.info(f"Creating a {request['duration']}-minute tour for {request['location']}... {job.message}")
+        time.sleep(2)
+        st.rerun()
 
 # ---------- Async helper ----------
-def run_async(func, *args, **kwargs):
-    try:
-        return asyncio.run(func(*args, **kwargs))
-    except RuntimeError:
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(func(*args, **kwargs))
+# Coroutines run on one long-lived background loop so pooled client connections are reused
+def run_with_preview(preview, func, *args):
+    # The coroutine runs on the background loop; paragraphs are rendered here on the script thread
+    from clients import submit
+
+    updates = queue.Queue()
+    future = submit(func(*args, updates.put))
+    shown = []
+    while not (future.done() and updates.empty()):
+        try:
+            shown.append(updates.get(timeout=0.2))
+            preview.text("\n\n".join(shown))
+        except queue.Empty:
+            pass
+    return future.result()
 
 # ---------- Page Config ----------
 st.set_page_config(
@@ -155,10 +308,14 @@ audio {
 }
 </style>
 """, unsafe_allow_html=True)
+rerun_timer.mark("page setup")
 
 # ---------- Session State ----------
 if "OPENAI_API_KEY" not in st.session_state:
     st.session_state["OPENAI_API_KEY"] = ""
+# Sections from earlier tours in this session; changing interests or duration only researches the difference
+if "research" not in st.session_state:
+    st.session_state["research"] = SessionResearch()
 
 # ---------- Sidebar ----------
 with st.sidebar:
@@ -170,7 +327,7 @@ with st.sidebar:
     if api_key:
         st.session_state["OPENAI_API_KEY"] = api_key
         try:
-            set_default_openai_key(api_key)
+            use_openai_key(api_key)
             st.success("API key set")
         except Exception as e:
             st.error(f"Error: {e}")
@@ -184,15 +341,36 @@ with st.sidebar:
 
     voice_style = st.selectbox("Voice Personality", ["Friendly", "Professional", "Energetic"])
 
+    # "Quick" computes the time split locally and skips the planner model call
+    planning = st.radio("Tour Planning", ["AI Planner", "Quick"], horizontal=True)
+    plan_mode = "local" if planning == "Quick" else "agent"
+
+    # "Fast" keeps the researched sections as written and only adds an intro, transitions and an outro
+    narration = st.radio("Narration", ["AI Narrator", "Fast"], horizontal=True)
+    assembly_mode = "stitched" if narration == "Fast" else "orchestrator"
+
+    # One web search briefs every specialist instead of each searching on its own
+    prefetch_search = st.checkbox("Shared web search", value=True)
+
     st.markdown("### 🌐 Language")
     language = st.selectbox(
         "Choose Language for Audio",
-        ["en", "fr", "es", "de", "it", "zh", "ar", "ur"],
+        list(LANGUAGE_NAMES),
+        format_func=language_name,
         index=0
     )
 
+    # "compact" and "speech" are smaller downloads for mobile listeners (re-encoded when ffmpeg is installed)
+    audio_profile = st.selectbox(
+        "Audio Quality",
+        list(AUDIO_PROFILES),
+        index=list(AUDIO_PROFILES).index(DEFAULT_AUDIO_PROFILE),
+        format_func=str.capitalize
+    )
+
     st.markdown("---")
     st.markdown("<p style='text-align:center;'>Powered by OpenAI</p>", unsafe_allow_html=True)
+rerun_timer.mark("sidebar")
 
 # ---------- Main ----------
 st.markdown("<h1 style='text-align:center;'>🌍 SonicGuide AI</h1>", unsafe_allow_html=True)
@@ -207,13 +385,17 @@ with col1:
         placeholder="✍️ Type your destination here (e.g., Paris, Kyoto Temples, Lahore Fort...)",
         label_visibility="collapsed"
     )
+    if location:
+        resolved = resolve_location(location)
+        if resolved.place is not None:
+            st.caption(f"📌 {resolved.name}")
     st.markdown("</div>", unsafe_allow_html=True)
 
 with col2:
     st.markdown("<div class='custom-card'><h3>🎯 Choose Interests</h3>", unsafe_allow_html=True)
     interests = st.multiselect(
         "interests_input",
-        ["History", "Architecture", "Food", "Culture"],
+        ui_labels(),
         default=["History", "Architecture"],
         label_visibility="collapsed"
     )
@@ -221,45 +403,63 @@ with col2:
 
 # ---------- Action ----------
 if st.button("🚀 Generate Tour", use_container_width=True):
-    if not st.session_state["OPENAI_API_KEY"]:
+    # Queue workers bring their own key, so one is only needed for inline generation against OpenAI
+    if not st.session_state["OPENAI_API_KEY"] and get_job_store() is None and not is_offline():
         st.error("Please enter your OpenAI API key in the sidebar.")
     elif not location:
         st.error("Please enter a destination.")
     elif not interests:
         st.error("Please choose at least one interest.")
     else:
-        with st.spinner(f"Creating a {duration}-minute tour for {location}..."):
-            try:
-                mgr = TourManager()
-                # (Ensure your TourManager expects simple strings for interests)
-                final_tour_content = run_async(mgr.run, location, interests, duration)
-
-                if final_tour_content:
-                    st.markdown("<div class='custom-card'><h3>📝 Tour Preview</h3>", unsafe_allow_html=True)
-                    st.text_area("", final_tour_content, height=300, label_visibility="collapsed")
-                    st.markdown("</div>", unsafe_allow_html=True)
-
-                    # Audio generation
-                    audio_file = tts(final_tour_content, st.session_state["OPENAI_API_KEY"], language=language)
-                    if audio_file and os.path.exists(audio_file):
-                        st.success("Audio generated")
-                        st.audio(audio_file, format="audio/mp3")
-                        with open(audio_file, "rb") as f:
-                            st.download_button(
-                                "💾 Download Audio (MP3)",
-                                f,
-                                file_name=f"sonicguide_{location.lower().replace(' ', '_')}_tour.mp3",
-                                mime="audio/mp3",
-                                use_container_width=True
-                            )
-                        try:
-                            os.unlink(audio_file)
-                        except:
-                            pass
-                    else:
-                        st.error("Audio generation failed. Please check your API key and try again.")
-            except Exception as e:
-                st.error(f"Error generating tour: {e}")
+        job_store = get_job_store()
+        if job_store is not None:
+            st.query_params["job"] = job_store.submit({
+                "location": location,
+                "interests": interests,
+                "duration": duration,
+                "language": language,
+                "plan_mode": plan_mode,
+                "assembly_mode": assembly_mode,
+                "prefetch_search": prefetch_search,
+                "audio_profile": audio_profile,
+            })
+        else:
+            with st.spinner(f"Creating a {duration}-minute tour for {location}..."):
+                try:
+                    mgr = get_tour_manager(st.session_state["OPENAI_API_KEY"], assembly_mode, prefetch_search)
+                    preview = st.empty()
+
+                    # Research, orchestration and audio synthesis overlap paragraph by paragraph
+                    final_tour_content, audio_file, metrics = run_with_preview(
+                        preview,
+                        generate_tour_audio,
+                        mgr,
+                        location,
+                        interests,
+                        duration,
+                        plan_mode,
+                        st.session_state["OPENAI_API_KEY"],
+                        language,
+                        get_audio_store(),
+                        audio_profile,
+                    )
+                    preview.empty()
+
+                    if final_tour_content:
+                        # Served straight from the audio store; the file stays cached for the next request
+                        show_tour(final_tour_content, audio_file, metrics.to_dict(), location)
+                except Exception as e:
+                    st.error(f"Error generating tour: {e}")
+
+if get_job_store() is not None and "job" in st.query_params:
+    poll_job(get_job_store(), st.query_params["job"])
 
 # ---------- Footer ----------
-st.markdown("<p class='footer-text' style='text-align:center; margin-top: 24px;'>© 2025 SonicGuide AI</p>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<p class='footer-text' style='text-align:center; margin-top: 24px;'>© 2025 SonicGuide AI</p>", unsafe_allow_html=True)
+
+# ---------- Profiling ----------
+rerun_timer.mark("main")
+get_rerun_profiler().finish(rerun_timer)
+if PROFILE_UI:
+    with st.sidebar.expander("⏱️ Rerun timings"):
+        st.json(get_rerun_profiler().summary())
\ No newline at end of file
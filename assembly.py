@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+
+from agent import TourLinks
+from interests import get_interest
+from planning import WORDS_PER_MINUTE, allocate_plan
+from locations import normalize_location
+from text_utils import split_sentences
+
+# "orchestrator" rewrites the whole tour with the orchestrator agent, "stitched" keeps the
+# specialist text verbatim and asks one small call for the intro, transitions and conclusion,
+# "template" fills those in locally without any model call
+ASSEMBLY_MODES = ("orchestrator", "stitched", "template")
+
+TRANSITION_WORDS = 30
+
+_INTRODUCTIONS = [
+    "Welcome to {location}! Over the next {duration} minutes we will explore {topics} together. "
+    "Get comfortable, take a look around you, and let's begin.",
+    "Hello and welcome to {location}. In this {duration}-minute tour we will take in {topics}. "
+    "Walk at your own pace, and let's get started.",
+]
+_LEAD_INS = [
+    "Let's begin with {topic}.",
+    "Now let's turn to {topic}.",
+    "Next, let's look at {topic}.",
+    "From here, let's explore {topic}.",
+]
+_CONCLUSIONS = [
+    "That brings our tour of {location} to a close. Thank you for joining me, and take your time "
+    "to keep exploring on your own.",
+    "And that is the end of our journey through {location}. I hope it showed you something new; "
+    "there is always more waiting around the next corner.",
+]
+def _topic(name: str) -> str:
+    interest = get_interest(name)
+    return interest.topic if interest is not None else name.lower()
+
+
+def _join_topics(topics: list[str]) -> str:
+    if len(topics) <= 1:
+        return "".join(topics)
+    return "{} and {}".format(", ".join(topics[:-1]), topics[-1])
+
+
+def template_links(location: str, duration: float, section_names: list[str]) -> TourLinks:
+    """Introduction, one lead-in per section and a conclusion from fixed phrasings, varied by location."""
+    rng = random.Random(normalize_location(location))
+    topics = [_topic(name) for name in section_names]
+    transitions = [
+        (_LEAD_INS[0] if index == 0 else rng.choice(_LEAD_INS[1:])).format(topic=topic)
+        for index, topic in enumerate(topics)
+    ]
+    return TourLinks(
+        introduction=rng.choice(_INTRODUCTIONS).format(
+            location=location, duration=int(float(duration)), topics=_join_topics(topics)
+        ),
+        transitions=transitions,
+        conclusion=rng.choice(_CONCLUSIONS).format(location=location),
+    )
+
+
+def build_links_prompt(location: str, interests: list, duration: float, sections: list[tuple[str, str]]) -> str:
+    # Only the seams are sent, so input tokens grow with the number of sections rather than the tour length
+    plan = allocate_plan(interests, duration)
+    outline = []
+    for index, (name, text) in enumerate(sections, start=1):
+        sentences = split_sentences(text) or [text]
+        outline.append(f'{index}. {name} - opens: "{sentences[0]}" ends: "{sentences[-1]}"')
+    sections_text = "\n".join(outline)
+    return (
+        f"Location: {location} | Interests: {', '.join(interests)} | Duration: {duration} minutes\n"
+        f"Introduction Word Limit: {max(TRANSITION_WORDS, int(plan.introduction * WORDS_PER_MINUTE))} words | "
+        f"Transition Word Limit: {TRANSITION_WORDS} words | "
+        f"Conclusion Word Limit: {max(TRANSITION_WORDS, int(plan.conclusion * WORDS_PER_MINUTE))} words\n\n"
+        f"Sections in order:\n{sections_text}"
+    )
+
+
+def stitch_tour(links: TourLinks, sections: list[tuple[str, str]], fallback: TourLinks | None = None) -> str:
+    """
+    Join the introduction, each section led in by its transition, and the conclusion into
+    one script with blank lines between paragraphs. Section text is kept verbatim; missing
+    pieces of ``links`` are taken from ``fallback``.
+    """
+    fallback = fallback or links
+    paragraphs = [links.introduction.strip() or fallback.introduction]
+    for index, (_, text) in enumerate(sections):
+        transition = links.transitions[index].strip() if index < len(links.transitions) else ""
+        if not transition and index < len(fallback.transitions):
+            transition = fallback.transitions[index]
+        first, *rest = [paragraph.strip() for paragraph in text.split("\n\n") if paragraph.strip()] or [""]
+        paragraphs.append(f"{transition} {first}".strip())
+        paragraphs.extend(rest)
+    paragraphs.append(links.conclusion.strip() or fallback.conclusion)
+    return "\n\n".join(paragraph for paragraph in paragraphs if paragraph)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+
+from audio_profiles import AUDIO_EXTENSIONS, AudioProfile, write_audio
+from research_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_AUDIO_MAX_BYTES = 1024 * 1024 * 1024
+
+
+@dataclass
+class AudioStoreStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    files: int = 0
+    bytes: int = 0
+
+
+class AudioStore:
+    """
+    Content-addressed audio store on local disk. Segments are keyed by a hash of
+    (text chunk, voice, model, language, format), so identical intros, conclusions and
+    repeated tours never pay for synthesis twice. Whole tours are assembled from segments
+    into ``tours/`` in their audio profile's encoding and can be served straight from there
+    (see audio_server.py). Files are evicted least recently used first once the store
+    exceeds ``max_bytes``; reads refresh a file's mtime.
+    """
+
+    def __init__(self, root: str | None = None, max_bytes: int = DEFAULT_AUDIO_MAX_BYTES) -> None:
+        self.root = root or os.path.join(DEFAULT_CACHE_DIR, "audio")
+        self.max_bytes = max_bytes
+        self.stats = AudioStoreStats()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.root, "segments"), exist_ok=True)
+        os.makedirs(os.path.join(self.root, "tours"), exist_ok=True)
+        self._sizes = {path: os.path.getsize(path) for path in self._walk()}
+
+    @staticmethod
+    def segment_key(text: str, voice: str, model: str, language: str, response_format: str = "mp3") -> str:
+        payload = "\x1f".join([model, voice, language, response_format, text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _walk(self):
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(AUDIO_EXTENSIONS):
+                    yield os.path.join(directory, name)
+
+    def segment_path(self, key: str, extension: str = "mp3") -> str:
+        return os.path.join(self.root, "segments", key[:2], f"{key}.{extension}")
+
+    def tour_path(self, key: str, extension: str = "mp3") -> str:
+        return os.path.join(self.root, "tours", f"{key}.{extension}")
+
+    def get(self, key: str, extension: str = "mp3") -> bytes | None:
+        path = self.segment_path(key, extension)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.stats.misses += 1
+            return None
+        with self._lock:
+            self.stats.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes, extension: str = "mp3") -> str:
+        path = self.segment_path(key, extension)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._write(path, [data])
+        return path
+
+    def assemble(self, segments: list[bytes], profile: AudioProfile | None = None) -> str:
+        """
+        Write a full tour from its segments, re-encoded for ``profile``, and return the file
+        path; identical tours share one file.
+        """
+        digest = hashlib.sha256(profile.name.encode("utf-8") if profile is not None else b"")
+        for segment in segments:
+            digest.update(hashlib.sha256(segment).digest())
+        path = self.tour_path(digest.hexdigest(), profile.extension if profile is not None else "mp3")
+        if os.path.exists(path):
+            os.utime(path)
+            return path
+        self._write(path, segments, profile)
+        return path
+
+    def _write(self, path: str, segments: list[bytes], profile: AudioProfile | None = None) -> None:
+        write_audio(path, segments, profile)
+        with self._lock:
+            self._sizes[path] = os.path.getsize(path)
+        self._evict(keep=path)
+
+    def _evict(self, keep: str) -> None:
+        with self._lock:
+            total = sum(self._sizes.values())
+            if total <= self.max_bytes:
+                return
+            candidates = []
+            for path in list(self._sizes):
+                try:
+                    candidates.append((os.path.getmtime(path), path))
+                except FileNotFoundError:
+                    total -= self._sizes.pop(path)
+            for _, path in sorted(candidates):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= self._sizes.pop(path)
+                self.stats.evictions += 1
+
+    def get_stats(self) -> AudioStoreStats:
+        with self._lock:
+            self.stats.files = len(self._sizes)
+            self.stats.bytes = sum(self._sizes.values())
+            return AudioStoreStats(**vars(self.stats))
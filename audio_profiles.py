@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import functools
+import os
+import shutil
+import subprocess
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# ffmpeg is optional: without it tours keep the codec the speech API returned
+FFMPEG = os.environ.get("SONICGUIDE_FFMPEG", "ffmpeg")
+
+
+@dataclass(frozen=True)
+class AudioProfile:
+    """
+    How a tour is encoded: ``response_format`` is requested from the speech API for every
+    segment; when ``bitrate`` is set and ffmpeg is available, the assembled tour is
+    re-encoded as mono at that bitrate with ``codec``.
+    """
+
+    name: str
+    response_format: str
+    extension: str
+    mime_type: str
+    codec: str | None = None
+    bitrate: str | None = None
+    sample_rate: int | None = None
+
+
+AUDIO_PROFILES = {
+    # The speech API's MP3 as is (about 128 kbps stereo)
+    "standard": AudioProfile("standard", "mp3", "mp3", "audio/mpeg"),
+    # Mono 48 kbps MP3: a third of the size and still plays everywhere
+    "compact": AudioProfile("compact", "mp3", "mp3", "audio/mpeg", "libmp3lame", "48k", 24000),
+    # Speech-tuned Opus at 24 kbps, the smallest; segments concatenate as chained Ogg without ffmpeg
+    "speech": AudioProfile("speech", "opus", "ogg", "audio/ogg", "libopus", "24k", 24000),
+}
+DEFAULT_AUDIO_PROFILE = os.environ.get("SONICGUIDE_AUDIO_PROFILE", "compact")
+AUDIO_EXTENSIONS = tuple(sorted({"." + profile.extension for profile in AUDIO_PROFILES.values()}))
+
+
+def get_profile(profile: AudioProfile | str | None = None) -> AudioProfile:
+    if isinstance(profile, AudioProfile):
+        return profile
+    name = profile or DEFAULT_AUDIO_PROFILE
+    if name not in AUDIO_PROFILES:
+        raise ValueError(f"Unknown audio profile {name!r}; expected one of {tuple(AUDIO_PROFILES)}")
+    return AUDIO_PROFILES[name]
+
+
+def mime_type_for(path: str) -> str:
+    extension = os.path.splitext(path)[1].lstrip(".")
+    for profile in AUDIO_PROFILES.values():
+        if profile.extension == extension:
+            return profile.mime_type
+    return "application/octet-stream"
+
+
+@functools.lru_cache(maxsize=None)
+def _ffmpeg_path() -> str | None:
+    return shutil.which(FFMPEG)
+
+
+def _encode(source: str, target: str, profile: AudioProfile) -> bool:
+    command = [
+        _ffmpeg_path(), "-hide_banner", "-loglevel", "error", "-y", "-i", source,
+        "-ac", "1", "-ar", str(profile.sample_rate), "-c:a", profile.codec, "-b:a", profile.bitrate,
+    ]
+    if profile.codec == "libopus":
+        command += ["-application", "voip"]
+    command += ["-f", "ogg" if profile.extension == "ogg" else profile.extension, target]
+    try:
+        subprocess.run(command, check=True, stdin=subprocess.DEVNULL, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return True
+
+
+def write_audio(path: str, segments: Iterable[bytes], profile: AudioProfile | None = None) -> None:
+    """
+    Write ``segments`` to ``path`` one at a time, re-encoding to ``profile`` when it asks
+    for it and ffmpeg is installed. Readers never see a half-written file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+    with open(tmp_path, "wb") as f:
+        for segment in segments:
+            f.write(segment)
+    if profile is not None and profile.bitrate and _ffmpeg_path():
+        encoded_path = f"{tmp_path}.{profile.extension}"
+        if _encode(tmp_path, encoded_path, profile):
+            os.replace(encoded_path, tmp_path)
+        elif os.path.exists(encoded_path):
+            os.unlink(encoded_path)
+    os.replace(tmp_path, path)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from audio_cache import AudioStore
+from audio_profiles import mime_type_for
+
+# Set SONICGUIDE_AUDIO_PORT to serve tours over HTTP instead of through Streamlit's media manager;
+# SONICGUIDE_AUDIO_URL is the address browsers use to reach it (e.g. behind a reverse proxy)
+DEFAULT_AUDIO_HOST = os.environ.get("SONICGUIDE_AUDIO_HOST", "127.0.0.1")
+DEFAULT_AUDIO_PORT = int(os.environ.get("SONICGUIDE_AUDIO_PORT", "0"))
+DEFAULT_AUDIO_URL = os.environ.get("SONICGUIDE_AUDIO_URL", "")
+
+# Only assembled tours are served: content-addressed names, so they can be cached forever
+_TOUR_PATH = re.compile(r"^/tours/([0-9a-f]{64}\.[a-z0-9]+)$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Inclusive (start, end) for a single-range ``Range`` header, None to send the whole
+    file, or raise ValueError when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if match is None or not any(match.groups()):
+        # Multi-range and malformed requests get the whole file, as RFC 9110 allows
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class AudioRequestHandler(BaseHTTPRequestHandler):
+    """GET/HEAD for ``/tours/<file>`` with byte ranges, sent from disk with sendfile."""
+
+    store: AudioStore
+
+    def do_HEAD(self) -> None:
+        self._serve(send_body=False)
+
+    def do_GET(self) -> None:
+        self._serve(send_body=True)
+
+    def _serve(self, send_body: bool) -> None:
+        url = urlsplit(self.path)
+        match = _TOUR_PATH.match(url.path)
+        if match is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        path = os.path.join(self.store.root, "tours", match.group(1))
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            try:
+                byte_range = parse_range(self.headers.get("Range"), size)
+            except ValueError:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start, end = byte_range or (0, size - 1)
+            if byte_range is None:
+                self.send_response(HTTPStatus.OK)
+            else:
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.send_header("Content-Type", mime_type_for(path))
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", f'"{match.group(1)}"')
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            download = parse_qs(url.query).get("download")
+            if download:
+                filename = re.sub(r"[^\w.-]", "_", download[0])
+                self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+            self.end_headers()
+            if send_body and end >= start:
+                # Kernel-side copy of just the requested bytes; memory stays flat whatever the tour length
+                try:
+                    self.connection.sendfile(f, offset=start, count=end - start + 1)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Players routinely drop a connection once they have the range they wanted
+                    pass
+        try:
+            # Plays count as use, so popular tours are the last to be evicted
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class AudioServer:
+    """Background HTTP server for the tours in one AudioStore."""
+
+    def __init__(
+        self,
+        store: AudioStore,
+        host: str = DEFAULT_AUDIO_HOST,
+        port: int = DEFAULT_AUDIO_PORT,
+        public_url: str = DEFAULT_AUDIO_URL,
+    ) -> None:
+        handler = type("StoreAudioRequestHandler", (AudioRequestHandler,), {"store": store})
+        self.store = store
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        if not public_url:
+            host, port = self.httpd.server_address[:2]
+            public_url = f"http://{'localhost' if host in ('0.0.0.0', '127.0.0.1') else host}:{port}"
+        self.public_url = public_url.rstrip("/")
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "AudioServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="sonicguide-audio", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url_for(self, path: str, download_name: str | None = None) -> str:
+        """URL of an assembled tour file; ``download_name`` makes browsers save it instead of playing it."""
+        url = f"{self.public_url}/tours/{os.path.basename(path)}"
+        if download_name:
+            url += "?download=" + re.sub(r"[^\w.-]", "_", download_name)
+        return url
+
+
+_server: AudioServer | None = None
+_server_lock = threading.Lock()
+
+
+def get_audio_server(store: AudioStore) -> AudioServer | None:
+    """The process-wide audio server when SONICGUIDE_AUDIO_PORT is set, started on first use."""
+    global _server
+    if not DEFAULT_AUDIO_PORT:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = AudioServer(store).start()
+        return _server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve assembled SonicGuide tours with HTTP range support")
+    parser.add_argument("--root", default=None, help="Audio store directory (default: the shared cache)")
+    parser.add_argument("--host", default=DEFAULT_AUDIO_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_AUDIO_PORT or 8765)
+    args = parser.parse_args()
+
+    server = AudioServer(AudioStore(args.root), host=args.host, port=args.port)
+    print(f"Serving tours from {server.store.root} at {server.public_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
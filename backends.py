@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+# The Agents SDK and OpenAI client load on first use, so checking the backend stays cheap (e.g. in the UI)
+if TYPE_CHECKING:
+    from agents import ModelProvider, RunConfig
+
+# "openai" calls the real APIs; "stub" answers every agent and speech call locally with canned
+# output, so the whole pipeline runs offline (development, CI, load tests)
+BACKENDS = ("openai", "stub")
+DEFAULT_BACKEND = os.environ.get("SONICGUIDE_BACKEND", "openai")
+# Synthetic seconds per stub model or speech call
+DEFAULT_STUB_LATENCY = float(os.environ.get("SONICGUIDE_STUB_LATENCY", "0.2"))
+
+_stub_provider = None
+
+
+def get_backend() -> str:
+    if DEFAULT_BACKEND not in BACKENDS:
+        raise ValueError(f"Unknown SONICGUIDE_BACKEND {DEFAULT_BACKEND!r}; expected one of {BACKENDS}")
+    return DEFAULT_BACKEND
+
+
+def is_offline() -> bool:
+    """True when no call leaves the machine, so no API key is needed."""
+    return get_backend() == "stub"
+
+
+def get_model_provider(api_key: str | None = None) -> ModelProvider:
+    global _stub_provider
+    if is_offline():
+        from stub_backend import StubModelProvider
+
+        if _stub_provider is None:
+            _stub_provider = StubModelProvider(latency=DEFAULT_STUB_LATENCY)
+        return _stub_provider
+    from clients import get_registry
+
+    return get_registry().get_model_provider(api_key)
+
+
+def get_run_config(api_key: str | None = None) -> RunConfig | None:
+    """RunConfig for the selected backend, or None to let the Agents SDK use its default client."""
+    from agents import RunConfig
+
+    if is_offline():
+        # Nothing to upload traces with, and nothing worth tracing
+        return RunConfig(model_provider=get_model_provider(), tracing_disabled=True)
+    if api_key:
+        return RunConfig(model_provider=get_model_provider(api_key))
+    return None
+
+
+def get_speech_client(api_key: str, max_retries: int = 2):
+    """Client for ``audio.speech.create``: the pooled OpenAI client, or a silent-MP3 stub offline."""
+    if is_offline():
+        from stub_backend import StubSpeechClient
+
+        return StubSpeechClient(latency=DEFAULT_STUB_LATENCY)
+    from clients import get_registry
+
+    # Shared pooled client; it retries 429/5xx responses itself, honouring Retry-After
+    return get_registry().get_async_client(api_key).with_options(max_retries=max_retries)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+
+from agents import RunConfig, set_default_openai_key
+
+from assembly import ASSEMBLY_MODES
+from audio_cache import AudioStore
+from audio_profiles import AUDIO_PROFILES, DEFAULT_AUDIO_PROFILE
+from backends import get_model_provider, is_offline
+from locations import location_key, normalize_location
+from manager import TourManager
+from printer import EventPrinter, NullPrinter, ProgressSink
+from research_cache import ResearchCache, SearchCache, TranslationCache
+from throttling import DEFAULT_MAX_RETRIES, ThrottledModelProvider
+from tts import TTS_MODEL, TTSPipeline
+
+PROGRESS_FILE = "progress.jsonl"
+
+
+@dataclass
+class BatchJob:
+    location: str
+    interests: list = field(default_factory=lambda: ["History", "Architecture"])
+    duration: int = 15
+    language: str = "en"
+    id: str | None = None
+
+    def job_id(self) -> str:
+        """Stable id derived from the request so a resumed batch recognises finished jobs."""
+        if self.id:
+            return self.id
+        key = json.dumps(
+            [location_key(self.location), sorted(self.interests), int(self.duration), self.language]
+        )
+        slug = re.sub(r"[^a-z0-9]+", "-", normalize_location(self.location)).strip("-")[:40]
+        return "{}-{}".format(slug, hashlib.sha1(key.encode("utf-8")).hexdigest()[:10])
+
+
+def load_jobs(path: str) -> list[BatchJob]:
+    """Read one job per line from a JSONL file; ``interests`` may be a list or a comma separated string."""
+    jobs = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            data = json.loads(line)
+            if "location" not in data:
+                raise ValueError(f"{path}:{line_number}: job is missing a location")
+            interests = data.get("interests", ["History", "Architecture"])
+            if isinstance(interests, str):
+                interests = [interest.strip() for interest in interests.split(",") if interest.strip()]
+            jobs.append(BatchJob(
+                location=data["location"],
+                interests=interests,
+                duration=int(data.get("duration", 15)),
+                language=data.get("language", "en"),
+                id=data.get("id"),
+            ))
+    return jobs
+
+
+def load_progress(output_dir: str) -> dict:
+    progress = {}
+    path = os.path.join(output_dir, PROGRESS_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    progress[record["id"]] = record
+    return progress
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # Write to a temp name first so an interrupted batch never leaves a truncated artifact
+    tmp_path = path + ".part"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class BatchRunner:
+    """
+    Generates many tours on a single event loop. ``max_jobs`` bounds concurrent tours,
+    ``max_requests`` bounds in-flight model calls across all of them and ``model_limits``
+    bounds calls per model name (the TTS model's limit applies to speech chunks).
+    Finished jobs are appended to ``progress.jsonl`` so a rerun skips them.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        api_key: str | None = None,
+        max_jobs: int = 4,
+        max_requests: int | None = 16,
+        model_limits: dict | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        plan_mode: str = "local",
+        assembly_mode: str = "orchestrator",
+        prefetch_search: bool = False,
+        search_cache: SearchCache | None = None,
+        translation_cache: TranslationCache | None = None,
+        audio: bool = True,
+        audio_profile: str = DEFAULT_AUDIO_PROFILE,
+        cache: ResearchCache | None = None,
+        audio_store: AudioStore | None = None,
+        quiet: bool = False,
+    ) -> None:
+        self.output_dir = output_dir
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+        self.max_jobs = max(1, max_jobs)
+        self.model_limits = dict(model_limits or {})
+        self.max_requests = max_requests
+        self.max_retries = max_retries
+        self.plan_mode = plan_mode
+        self.assembly_mode = assembly_mode
+        self.prefetch_search = prefetch_search
+        self.search_cache = search_cache
+        self.translation_cache = translation_cache
+        self.audio = audio
+        self.audio_profile = audio_profile
+        self.cache = cache
+        self.audio_store = audio_store
+        self.quiet = quiet
+
+    async def run(self, jobs: list[BatchJob]) -> list[dict]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        progress = load_progress(self.output_dir)
+        pending = [job for job in jobs if progress.get(job.job_id(), {}).get("status") != "done"]
+
+        provider = ThrottledModelProvider(
+            get_model_provider(self.api_key) if self.api_key or is_offline() else None,
+            max_concurrency=self.max_requests,
+            model_limits=self.model_limits,
+            max_retries=self.max_retries,
+        )
+        run_config = RunConfig(model_provider=provider, tracing_disabled=is_offline())
+        tts_pipeline = None
+        if self.audio:
+            tts_pipeline = TTSPipeline(
+                self.api_key,
+                max_concurrency=self.model_limits.get(TTS_MODEL, 4),
+                max_retries=self.max_retries,
+                store=self.audio_store,
+                profile=self.audio_profile,
+            )
+
+        semaphore = asyncio.Semaphore(self.max_jobs)
+        progress_path = os.path.join(self.output_dir, PROGRESS_FILE)
+
+        async def run_job(job: BatchJob) -> dict:
+            job_id = job.job_id()
+            record = {"id": job_id, "location": job.location}
+            async with semaphore:
+                try:
+                    # Managers are cheap; every job shares the throttled provider through run_config
+                    manager = TourManager(
+                        cache=self.cache,
+                        plan_mode=self.plan_mode,
+                        assembly_mode=self.assembly_mode,
+                        prefetch_search=self.prefetch_search,
+                        search_cache=self.search_cache,
+                        translation_cache=self.translation_cache,
+                        run_config=run_config,
+                        printer=self._make_printer(job_id),
+                    )
+                    text = await manager.run(job.location, job.interests, job.duration, language=job.language)
+                    text_path = os.path.join(self.output_dir, job_id + ".txt")
+                    _write_atomic(text_path, text.encode("utf-8"))
+                    record["text"] = text_path
+                    if tts_pipeline is not None:
+                        record["audio"] = await tts_pipeline.synthesize_to_file(
+                            text, os.path.join(self.output_dir, job_id), job.language
+                        )
+                    record["status"] = "done"
+                except Exception as e:
+                    record["status"] = "failed"
+                    record["error"] = str(e)
+            with open(progress_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            return record
+
+        return await asyncio.gather(*(run_job(job) for job in pending))
+
+    def _make_printer(self, job_id: str) -> ProgressSink:
+        # Plain log lines instead of a Live display, which concurrent jobs would fight over
+        if self.quiet:
+            return NullPrinter()
+
+        def log(event: dict) -> None:
+            if event["event"] == "update" and event["is_done"] and event["item_id"] != "trace_id":
+                print(f"[{job_id}] {event['content']}")
+
+        return EventPrinter(log)
+
+
+def _parse_model_limits(values: list) -> dict:
+    limits = {}
+    for value in values:
+        name, _, limit = value.partition("=")
+        if not name or not limit.isdigit():
+            raise argparse.ArgumentTypeError(f"Expected MODEL=N, got {value!r}")
+        limits[name] = int(limit)
+    return limits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-generate SonicGuide tours from a JSONL file of jobs")
+    parser.add_argument("jobs", help="JSONL file with one {location, interests, duration, language} job per line")
+    parser.add_argument("--out", default="tours", help="Directory for text and audio artifacts and progress.jsonl")
+    parser.add_argument("--jobs", dest="max_jobs", type=int, default=4, help="Tours generated at the same time")
+    parser.add_argument("--max-requests", type=int, default=16, help="Model calls in flight across all tours")
+    parser.add_argument("--model-limit", action="append", default=[], metavar="MODEL=N",
+                        help="Per-model concurrency limit, e.g. gpt-4o=2 or tts-1=4 (repeatable)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_MAX_RETRIES, help="Retries per rate-limited call")
+    parser.add_argument("--plan-mode", default="local", choices=["agent", "local", "speculative"])
+    parser.add_argument("--assembly-mode", default="orchestrator", choices=list(ASSEMBLY_MODES),
+                        help="How specialist sections are joined into the final tour")
+    parser.add_argument("--prefetch-search", action="store_true",
+                        help="Run one shared web search per location instead of one per specialist")
+    parser.add_argument("--no-audio", action="store_true", help="Only write the tour text")
+    parser.add_argument("--audio-profile", default=DEFAULT_AUDIO_PROFILE, choices=list(AUDIO_PROFILES),
+                        help="Audio codec and bitrate; compact and speech re-encode with ffmpeg when installed")
+    parser.add_argument("--quiet", action="store_true", help="Do not print per-stage progress")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or fill the research and audio caches")
+    args = parser.parse_args()
+
+    api_key = os.environ.get("OPENAI_API_KEY", "")
+    if not api_key and not is_offline():
+        parser.error("OPENAI_API_KEY must be set")
+    if api_key:
+        set_default_openai_key(api_key)
+
+    runner = BatchRunner(
+        args.out,
+        api_key=api_key,
+        max_jobs=args.max_jobs,
+        max_requests=args.max_requests,
+        model_limits=_parse_model_limits(args.model_limit),
+        max_retries=args.retries,
+        plan_mode=args.plan_mode,
+        assembly_mode=args.assembly_mode,
+        prefetch_search=args.prefetch_search,
+        search_cache=None if args.no_cache else SearchCache(),
+        translation_cache=None if args.no_cache else TranslationCache(),
+        audio=not args.no_audio,
+        audio_profile=args.audio_profile,
+        cache=None if args.no_cache else ResearchCache(),
+        audio_store=None if args.no_cache else AudioStore(),
+        quiet=args.quiet,
+    )
+    results = asyncio.run(runner.run(load_jobs(args.jobs)))
+    failed = [record for record in results if record["status"] != "done"]
+    print(f"{len(results) - len(failed)} tours generated, {len(failed)} failed")
+    for record in failed:
+        print(f"  {record['id']}: {record['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+
+from agents import RunConfig, set_tracing_disabled
+
+from assembly import ASSEMBLY_MODES
+from manager import TourManager
+from metrics import RunMetrics, collect_metrics, percentile
+from printer import NullPrinter
+from stub_backend import StubModelProvider, StubSpeechClient
+from tts import TTSPipeline
+
+# Fixed replay set: (location, interests, duration in minutes)
+BENCHMARK_TOURS = [
+    ("Lahore Fort", ["History", "Architecture"], 10),
+    ("Paris", ["Architecture", "Culture", "Culinary"], 15),
+    ("Kyoto Temples", ["History", "Culture"], 5),
+    ("Rome", ["Architecture", "History", "Culture", "Culinary"], 30),
+    ("Istanbul", ["Culinary"], 1),
+]
+
+# Synthetic per-model latency in seconds, roughly the relative speed of the real tiers
+DEFAULT_LATENCY = {"gpt-4o": 0.4, "gpt-4o-mini": 0.25}
+DEFAULT_TTS_LATENCY = 0.3
+
+
+async def _run_tour(location: str, interests: list, duration: int, plan_mode: str, assembly_mode: str, stream: bool,
+                    provider: StubModelProvider, tts: TTSPipeline | None) -> RunMetrics:
+    manager = TourManager(
+        printer=NullPrinter(),
+        plan_mode=plan_mode,
+        assembly_mode=assembly_mode,
+        run_config=RunConfig(model_provider=provider, tracing_disabled=True),
+    )
+    with collect_metrics() as metrics:
+        if stream and tts is not None:
+            async for _ in tts.stream_paragraphs(manager.stream(location, interests, duration)):
+                pass
+        elif stream:
+            async for _ in manager.stream(location, interests, duration):
+                pass
+        else:
+            text = await manager.run(location, interests, duration)
+            if tts is not None:
+                await tts.synthesize(text)
+    return metrics
+
+
+async def run_benchmark(
+    iterations: int = 5,
+    plan_mode: str = "agent",
+    stream: bool = False,
+    latency: dict | float | None = None,
+    jitter: float = 0.05,
+    assembly_mode: str = "orchestrator",
+    audio: bool = False,
+) -> dict:
+    """Replay BENCHMARK_TOURS ``iterations`` times and report p50/p95 seconds per stage and in total."""
+    provider = StubModelProvider(latency=DEFAULT_LATENCY if latency is None else latency, jitter=jitter)
+    tts = TTSPipeline("", client=StubSpeechClient(DEFAULT_TTS_LATENCY)) if audio else None
+    stage_seconds: dict[str, list] = {}
+    totals = []
+    for _ in range(iterations):
+        for location, interests, duration in BENCHMARK_TOURS:
+            metrics = await _run_tour(location, interests, duration, plan_mode, assembly_mode, stream, provider, tts)
+            totals.append(metrics.total_seconds)
+            for name, stage in metrics.stages.items():
+                stage_seconds.setdefault(name, []).append(stage.seconds)
+
+    report = {
+        name: {"p50": percentile(values, 50), "p95": percentile(values, 95), "samples": len(values)}
+        for name, values in sorted(stage_seconds.items())
+    }
+    report["total"] = {"p50": percentile(totals, 50), "p95": percentile(totals, 95), "samples": len(totals)}
+    return report
+
+
+def find_regressions(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in report.items():
+        previous = baseline.get(name)
+        if previous and current["p95"] > previous["p95"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95']:.3f}s -> {current['p95']:.3f}s")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay fixed tours against the local stub models")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--plan-mode", default="agent", choices=["agent", "local", "speculative"])
+    parser.add_argument("--assembly-mode", default="orchestrator", choices=list(ASSEMBLY_MODES))
+    parser.add_argument("--stream", action="store_true", help="Benchmark TourManager.stream instead of run")
+    parser.add_argument("--audio", action="store_true", help="Include TTS, using silent stub audio")
+    parser.add_argument("--latency", type=float, default=None, help="Fixed stub latency for every model, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--save", help="Write the report as JSON (e.g. to use as a baseline)")
+    parser.add_argument("--baseline", help="Fail if any p95 is slower than this saved report")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 slowdown against the baseline")
+    args = parser.parse_args()
+
+    set_tracing_disabled(True)
+    report = asyncio.run(
+        run_benchmark(
+            args.iterations, args.plan_mode, args.stream, args.latency, args.jitter, args.assembly_mode, args.audio
+        )
+    )
+
+    print(f"{'stage':<16}{'p50 (s)':>10}{'p95 (s)':>10}{'n':>6}")
+    for name, row in report.items():
+        print(f"{name:<16}{row['p50']:>10.3f}{row['p95']:>10.3f}{row['samples']:>6}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import importlib.util
+import threading
+from dataclasses import dataclass
+
+import httpx
+import openai
+from agents import OpenAIProvider
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_KEEPALIVE_EXPIRY = 120.0
+
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass
+class PoolStats:
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    connections: int = 0
+    idle_connections: int = 0
+    async_clients: int = 0
+    sync_clients: int = 0
+    http2: bool = False
+
+
+class _CountingAsyncTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, stats: PoolStats, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.requests += 1
+        self.stats.in_flight += 1
+        try:
+            return await super().handle_async_request(request)
+        except Exception:
+            self.stats.errors += 1
+            raise
+        finally:
+            self.stats.in_flight -= 1
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    def __init__(self, stats: PoolStats, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.requests += 1
+        self.stats.in_flight += 1
+        try:
+            return super().handle_request(request)
+        except Exception:
+            self.stats.errors += 1
+            raise
+        finally:
+            self.stats.in_flight -= 1
+
+
+class ClientRegistry:
+    """
+    Process-wide cache of OpenAI clients keyed by API key, so HTTP connections, TLS
+    sessions and keep-alive are reused across tours. Async clients are bound to the
+    event loop they were first used on; use ``run_sync`` to keep every tour on the
+    shared background loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: bool | None = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2 and HTTP2_AVAILABLE
+        self._stats = PoolStats(http2=self.http2)
+        self._lock = threading.Lock()
+        self._async_clients: dict[str, tuple[asyncio.AbstractEventLoop | None, openai.AsyncOpenAI]] = {}
+        self._sync_clients: dict[str, openai.OpenAI] = {}
+        self._transports: list[httpx.AsyncHTTPTransport | httpx.HTTPTransport] = []
+
+    def get_async_client(self, api_key: str) -> openai.AsyncOpenAI:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._lock:
+            entry = self._async_clients.get(api_key)
+            if entry is not None:
+                bound_loop, client = entry
+                # Pooled async connections cannot move between event loops
+                if bound_loop is None or loop is None or bound_loop is loop:
+                    return client
+            transport = _CountingAsyncTransport(self._stats, limits=self.limits, http2=self.http2)
+            self._transports.append(transport)
+            client = openai.AsyncOpenAI(
+                api_key=api_key,
+                http_client=openai.DefaultAsyncHttpxClient(transport=transport),
+            )
+            self._async_clients[api_key] = (loop, client)
+            return client
+
+    def get_sync_client(self, api_key: str) -> openai.OpenAI:
+        with self._lock:
+            client = self._sync_clients.get(api_key)
+            if client is None:
+                transport = _CountingTransport(self._stats, limits=self.limits, http2=self.http2)
+                self._transports.append(transport)
+                client = openai.OpenAI(
+                    api_key=api_key,
+                    http_client=openai.DefaultHttpxClient(transport=transport),
+                )
+                self._sync_clients[api_key] = client
+            return client
+
+    def get_model_provider(self, api_key: str) -> OpenAIProvider:
+        """Agents SDK model provider backed by the pooled async client for ``api_key``."""
+        return OpenAIProvider(openai_client=self.get_async_client(api_key))
+
+    def stats(self) -> PoolStats:
+        connections = idle = 0
+        with self._lock:
+            for transport in self._transports:
+                pool = getattr(transport, "_pool", None)
+                for connection in getattr(pool, "connections", []):
+                    connections += 1
+                    idle += connection.is_idle()
+            self._stats.connections = connections
+            self._stats.idle_connections = idle
+            self._stats.async_clients = len(self._async_clients)
+            self._stats.sync_clients = len(self._sync_clients)
+        return PoolStats(**vars(self._stats))
+
+
+_registry: ClientRegistry | None = None
+_registry_lock = threading.Lock()
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def get_registry() -> ClientRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ClientRegistry()
+        return _registry
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Long-lived event loop on a daemon thread that owns every pooled async client."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="sonicguide-loop", daemon=True).start()
+        return _loop
+
+
+def submit(coro) -> concurrent.futures.Future:
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def run_sync(coro, timeout: float | None = None):
+    """Run a coroutine on the shared loop from synchronous code and wait for its result."""
+    return submit(coro).result(timeout)
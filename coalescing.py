@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass
+class CoalescingStats:
+    leaders: int = 0
+    followers: int = 0
+    in_flight: int = 0
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class _SharedStream:
+    """Items of one async iterator, kept so that every subscriber sees all of them in order."""
+
+    def __init__(self) -> None:
+        self.items: list = []
+        self.finished = False
+        self.error: BaseException | None = None
+        self.subscribers = 0
+        self.task: asyncio.Task | None = None
+        self._updated = asyncio.Event()
+
+    def _notify(self) -> None:
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def pump(self, source: AsyncIterator) -> None:
+        try:
+            async for item in source:
+                self.items.append(item)
+                self._notify()
+        except Exception as e:
+            # Handed to every subscriber instead of being raised from an unawaited task
+            self.error = e
+        finally:
+            self.finished = True
+            self._notify()
+
+    async def subscribe(self) -> AsyncIterator:
+        index = 0
+        while True:
+            if index < len(self.items):
+                yield self.items[index]
+                index += 1
+            elif self.finished:
+                if self.error is not None:
+                    raise self.error
+                if self.task.cancelled():
+                    raise asyncio.CancelledError()
+                return
+            else:
+                await self._updated.wait()
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one in-progress task. The first
+    caller starts the work; callers arriving while it runs await the same result, or with
+    ``stream`` read the same items. The
+    task keeps running while anyone still waits for it and is cancelled only when every
+    waiter has gone. Flights are tracked per event loop because tasks cannot cross loops.
+    """
+
+    def __init__(self) -> None:
+        self.stats = CoalescingStats()
+        self._lock = threading.Lock()
+        self._flights: dict[tuple[int, Hashable], _Flight] = {}
+        self._streams: dict[tuple[int, Hashable], _SharedStream] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            return flight_key in self._flights or flight_key in self._streams
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]):
+        """Return ``await func()``, sharing the call with any identical one already running."""
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            if flight is None:
+                flight = _Flight(asyncio.ensure_future(func()))
+                self._flights[flight_key] = flight
+                flight.task.add_done_callback(lambda _: self._forget(flight_key, flight))
+                self.stats.leaders += 1
+            else:
+                self.stats.followers += 1
+            flight.waiters += 1
+
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                abandoned = flight.waiters == 1
+            if abandoned:
+                flight.task.cancel()
+            raise
+        finally:
+            with self._lock:
+                flight.waiters -= 1
+
+    async def stream(self, key: Hashable, func: Callable[[], AsyncIterator]) -> AsyncIterator:
+        """
+        Yield the items of ``func()``, sharing one iteration with an identical stream already
+        running. Late joiners first get every item produced so far, then the rest as it
+        arrives. The iteration is cancelled only when every subscriber has gone.
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            shared = self._streams.get(flight_key)
+            if shared is None:
+                shared = _SharedStream()
+                shared.task = asyncio.ensure_future(shared.pump(func()))
+                self._streams[flight_key] = shared
+                shared.task.add_done_callback(lambda _: self._forget_stream(flight_key, shared))
+                self.stats.leaders += 1
+            else:
+                self.stats.followers += 1
+            shared.subscribers += 1
+
+        try:
+            async for item in shared.subscribe():
+                yield item
+        finally:
+            with self._lock:
+                shared.subscribers -= 1
+                abandoned = shared.subscribers == 0
+            if abandoned:
+                shared.task.cancel()
+
+    def _forget(self, flight_key: tuple[int, Hashable], flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+
+    def _forget_stream(self, flight_key: tuple[int, Hashable], shared: _SharedStream) -> None:
+        with self._lock:
+            if self._streams.get(flight_key) is shared:
+                del self._streams[flight_key]
+
+    def get_stats(self) -> CoalescingStats:
+        with self._lock:
+            self.stats.in_flight = len(self._flights) + len(self._streams)
+            return CoalescingStats(**vars(self.stats))
+
+
+_single_flight: SingleFlight | None = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide SingleFlight shared by every TourManager."""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
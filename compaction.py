@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import functools
+import math
+import re
+from dataclasses import dataclass
+
+from text_utils import split_sentences
+
+try:
+    import tiktoken
+except ImportError:  # optional: pip install tiktoken for exact counts
+    tiktoken = None
+
+# Orchestrator prompt ceiling; roughly 6000 words of research, about a 40-minute tour
+DEFAULT_MAX_INPUT_TOKENS = 8000
+# Content-word overlap above which a sentence counts as a repeat of an earlier one
+DEFAULT_DUPLICATE_THRESHOLD = 0.6
+# Sentences with fewer content words than this are too short to judge and always kept
+_MIN_CONTENT_WORDS = 5
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Token count from tiktoken when installed, else the usual 4-characters-per-token estimate."""
+    if tiktoken is None:
+        return math.ceil(len(text) / 4)
+    return len(_encoding(model).encode(text))
+
+
+@dataclass
+class CompactionStats:
+    tokens_before: int = 0
+    tokens_after: int = 0
+    duplicate_sentences: int = 0
+    trimmed_sentences: int = 0
+
+
+def _content_words(sentence: str) -> frozenset:
+    return frozenset(word for word in _WORD.findall(sentence.lower()) if len(word) > 3)
+
+
+def _is_duplicate(words: frozenset, seen: list, threshold: float) -> bool:
+    for other in seen:
+        if len(words & other) / len(words | other) >= threshold:
+            return True
+    return False
+
+
+def dedupe_sections(
+    sections: list[tuple[str, str]], threshold: float = DEFAULT_DUPLICATE_THRESHOLD
+) -> tuple[list[tuple[str, str]], int]:
+    """
+    Drop sentences that repeat a sentence from an earlier section (or earlier in the same
+    one), e.g. History and Architecture both describing the same landmark. Returns the
+    sections with paragraph breaks kept and the number of sentences removed.
+    """
+    seen: list[frozenset] = []
+    removed = 0
+    deduped = []
+    for name, text in sections:
+        paragraphs = []
+        for paragraph in text.split("\n\n"):
+            kept = []
+            for sentence in split_sentences(paragraph):
+                words = _content_words(sentence)
+                if len(words) >= _MIN_CONTENT_WORDS:
+                    if _is_duplicate(words, seen, threshold):
+                        removed += 1
+                        continue
+                    seen.append(words)
+                kept.append(sentence)
+            if kept:
+                paragraphs.append(" ".join(kept))
+        deduped.append((name, "\n\n".join(paragraphs)))
+    return deduped, removed
+
+
+def trim_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o-mini") -> tuple[str, int]:
+    """Keep whole leading sentences that fit in ``max_tokens``; returns the text and sentences dropped."""
+    paragraphs, total, dropped = [], 0, 0
+    for paragraph in text.split("\n\n"):
+        kept = []
+        for sentence in split_sentences(paragraph):
+            tokens = count_tokens(sentence, model) + 1
+            if dropped or total + tokens > max_tokens:
+                dropped += 1
+                continue
+            kept.append(sentence)
+            total += tokens
+        if kept:
+            paragraphs.append(" ".join(kept))
+    return "\n\n".join(paragraphs), dropped
+
+
+def compact_sections(
+    sections: list[tuple[str, str]],
+    max_tokens: int | None,
+    model: str = "gpt-4o-mini",
+    threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+) -> tuple[list[tuple[str, str]], CompactionStats]:
+    """
+    Deduplicate ``sections`` and, if they still exceed ``max_tokens``, shorten each one in
+    proportion to its size so every selected interest stays represented.
+    """
+    stats = CompactionStats(tokens_before=sum(count_tokens(text, model) for _, text in sections))
+    sections, stats.duplicate_sentences = dedupe_sections(sections, threshold)
+
+    sizes = [count_tokens(text, model) for _, text in sections]
+    total = sum(sizes)
+    if max_tokens is not None and total > max_tokens:
+        compacted = []
+        for (name, text), size in zip(sections, sizes):
+            text, dropped = trim_to_tokens(text, max(1, max_tokens * size // total), model)
+            stats.trimmed_sentences += dropped
+            compacted.append((name, text))
+        sections = compacted
+
+    stats.tokens_after = sum(count_tokens(text, model) for _, text in sections)
+    return sections, stats
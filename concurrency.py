@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable
+
+
+async def run_in_order(awaitables: AsyncIterator[Awaitable]) -> AsyncIterator:
+    """
+    Start each awaitable as soon as ``awaitables`` produces it and yield the results in
+    the order they were produced, so later items run while earlier ones are still being
+    waited on. Errors from an item or from ``awaitables`` itself are raised to the caller;
+    stopping early cancels everything still running.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    tasks: list[asyncio.Task] = []
+
+    async def schedule():
+        try:
+            async for awaitable in awaitables:
+                task = asyncio.ensure_future(awaitable)
+                tasks.append(task)
+                await pending.put(task)
+        finally:
+            await pending.put(None)
+
+    producer = asyncio.create_task(schedule())
+    try:
+        while (task := await pending.get()) is not None:
+            yield await task
+        # Surface any error raised while reading ``awaitables``
+        await producer
+    finally:
+        producer.cancel()
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+    from agents import Agent
+
+
+def _load(ref):
+    # Built-in specialists name their agent.py objects, so listing interests does not load the Agents SDK
+    if isinstance(ref, str):
+        return getattr(importlib.import_module("agent"), ref)
+    return ref
+
+
+@dataclass(frozen=True)
+class Interest:
+    """
+    Everything the pipeline needs to research one kind of tour section. ``name`` is the
+    canonical section name used for plans, caches, metrics and progress; ``label`` is
+    what the UI shows; ``aliases`` are other names users or callers may pass. The agents
+    and output type may be given as the names of objects in agent.py, loaded on first use.
+    """
+
+    name: str
+    label: str
+    agent: Agent | str
+    output_type: type[BaseModel] | str
+    prompt: str
+    topic: str
+    progress_message: str
+    briefed_agent: Agent | str | None = None
+    aliases: tuple[str, ...] = field(default_factory=tuple)
+
+    def specialist(self, briefed: bool = False) -> tuple[Agent, type[BaseModel]]:
+        """The agent to run (the briefed variant when asked for and available) and its output type."""
+        agent = self.briefed_agent if briefed and self.briefed_agent is not None else self.agent
+        return _load(agent), _load(self.output_type)
+
+    def build_prompt(self, location: str, interests: list, word_limit: int) -> str:
+        return "Location: {} | Interests: {} | Word Limit: {} words. {}".format(
+            location, ", ".join(interests), word_limit, self.prompt
+        )
+
+
+# Registration order is the order sections appear in a tour (see ORCHESTRATOR_INSTRUCTIONS)
+_registry: dict[str, Interest] = {}
+
+
+def register_interest(interest: Interest) -> None:
+    """Add (or replace) a specialist; the manager, planner fallback and UI pick it up from here."""
+    _registry[interest.name] = interest
+
+
+def get_interest(name: str) -> Interest | None:
+    """Look an interest up by canonical name, UI label or alias, ignoring case."""
+    wanted = name.strip().lower()
+    for interest in _registry.values():
+        if wanted in (interest.name.lower(), interest.label.lower(), *(alias.lower() for alias in interest.aliases)):
+            return interest
+    return None
+
+
+def resolve_interests(names: list) -> list[str]:
+    """Canonical names for ``names`` in selection order, without duplicates or unknown entries."""
+    resolved = []
+    for name in names:
+        interest = get_interest(name)
+        if interest is not None and interest.name not in resolved:
+            resolved.append(interest.name)
+    return resolved
+
+
+def section_order() -> list[str]:
+    return list(_registry)
+
+
+def ui_labels() -> list[str]:
+    return [interest.label for interest in _registry.values()]
+
+
+register_interest(Interest(
+    name="Architecture",
+    label="Architecture",
+    agent="architecture_agent",
+    briefed_agent="architecture_briefed_agent",
+    output_type="Architecture",
+    prompt="Create engaging architectural content for an audio tour. Focus on visual descriptions and interesting design details. Make it conversational and natural for speech.",
+    topic="the architecture",
+    progress_message="Exploring architectural wonders...",
+    aliases=("Buildings", "Design"),
+))
+register_interest(Interest(
+    name="History",
+    label="History",
+    agent="historical_agent",
+    briefed_agent="historical_briefed_agent",
+    output_type="History",
+    prompt="Create engaging historical content for an audio tour. Focus on interesting stories and personal connections. Make it conversational and natural for speech.",
+    topic="the history",
+    progress_message="Researching historical highlights...",
+    aliases=("Historical", "Heritage"),
+))
+register_interest(Interest(
+    name="Culture",
+    label="Culture",
+    agent="culture_agent",
+    briefed_agent="culture_briefed_agent",
+    output_type="Culture",
+    prompt="Create engaging cultural content for an audio tour. Focus on local traditions and community life. Make it conversational and natural for speech.",
+    topic="the local culture",
+    progress_message="Exploring cultural highlights...",
+    aliases=("Cultural", "Traditions"),
+))
+register_interest(Interest(
+    name="Culinary",
+    label="Food",
+    agent="culinary_agent",
+    briefed_agent="culinary_briefed_agent",
+    output_type="Culinary",
+    prompt="Create engaging culinary content for an audio tour. Focus on local specialties and food stories. Make it conversational and natural for speech.",
+    topic="the food",
+    progress_message="Discovering local flavors...",
+    aliases=("Food & Drink", "Cuisine", "Dining"),
+))
@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from locations import location_key
+from research_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_JOB_DB = os.environ.get("SONICGUIDE_JOB_DB", os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite3"))
+# A running job whose worker has been silent this long is assumed dead and requeued
+DEFAULT_STALE_SECONDS = 15 * 60
+POLL_INTERVAL = 1.0
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    status: str
+    request: dict
+    message: str = ""
+    result_text: str | None = None
+    audio_path: str | None = None
+    metrics: dict | None = None
+    error: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+
+def request_key(request: dict) -> str:
+    """Identity of a tour request; identical in-flight requests share one job."""
+    key = json.dumps([
+        location_key(request["location"]),
+        sorted(request["interests"]),
+        int(request["duration"]),
+        request.get("language", "en"),
+        request.get("plan_mode", "agent"),
+        request.get("assembly_mode", "orchestrator"),
+        bool(request.get("prefetch_search", False)),
+        request.get("audio_profile"),
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """
+    Persistent SQLite job queue shared by the web tier and worker processes. The web tier
+    calls ``submit``/``status``/``result``; workers ``claim`` queued jobs and report back.
+    API keys are never stored: workers use the key from their own environment.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOB_DB) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                request_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                request TEXT NOT NULL,
+                message TEXT NOT NULL DEFAULT '',
+                result_text TEXT,
+                audio_path TEXT,
+                metrics TEXT,
+                error TEXT,
+                worker TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_request_key ON jobs (request_key, status)")
+
+    def submit(self, request: dict) -> str:
+        """Queue a tour request, or return the id of an identical job that is already queued or running."""
+        key = request_key(request)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE request_key = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                    (key, QUEUED, RUNNING),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("COMMIT")
+                    return row[0]
+                job_id = uuid.uuid4().hex
+                self._conn.execute(
+                    "INSERT INTO jobs (id, request_key, status, request, message, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, key, QUEUED, json.dumps(request), "Waiting for a worker...", now, now),
+                )
+                self._conn.execute("COMMIT")
+                return job_id
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def status(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, request, message, result_text, audio_path, metrics, error, created_at, updated_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Job(
+            id=row[0],
+            status=row[1],
+            request=json.loads(row[2]),
+            message=row[3],
+            result_text=row[4],
+            audio_path=row[5],
+            metrics=json.loads(row[6]) if row[6] else None,
+            error=row[7],
+            created_at=row[8],
+            updated_at=row[9],
+        )
+
+    def result(self, job_id: str) -> Job | None:
+        """The finished job, or None while it is still queued or running."""
+        job = self.status(job_id)
+        if job is None or job.status not in (DONE, FAILED):
+            return None
+        return job
+
+    def claim(self, worker: str, stale_seconds: float = DEFAULT_STALE_SECONDS) -> Job | None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs abandoned by a crashed worker go back to the queue
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, message = ? WHERE status = ? AND updated_at < ?",
+                    (QUEUED, "Requeued after a worker stopped responding", RUNNING, now - stale_seconds),
+                )
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, message = ?, updated_at = ? WHERE id = ?",
+                    (RUNNING, worker, "Starting tour research...", now, row[0]),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.status(row[0])
+
+    def update_progress(self, job_id: str, message: str) -> None:
+        # Doubles as the worker heartbeat
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET message = ?, updated_at = ? WHERE id = ?", (message, time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result_text: str, audio_path: str | None, metrics: dict | None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, result_text = ?, audio_path = ?, metrics = ?, "
+                "updated_at = ? WHERE id = ?",
+                (DONE, "Tour generation completed", result_text, audio_path,
+                 json.dumps(metrics) if metrics else None, time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, error = ?, updated_at = ? WHERE id = ?",
+                (FAILED, "Tour generation failed", error, time.time(), job_id),
+            )
+
+
+@dataclass
+class WorkerCaches:
+    """Caches opened once per worker process and shared by every job it runs."""
+
+    research: object
+    search: object
+    translation: object
+    audio: object
+
+
+def _open_caches() -> WorkerCaches:
+    # Imported here so the web tier can use JobStore without loading the agent stack
+    from audio_cache import AudioStore
+    from research_cache import ResearchCache, SearchCache, TranslationCache
+
+    return WorkerCaches(ResearchCache(), SearchCache(), TranslationCache(), AudioStore())
+
+
+async def _process_job(store: JobStore, job: Job, api_key: str, caches: WorkerCaches) -> None:
+    from manager import TourManager
+    from printer import EventPrinter
+    from tts import TTSPipeline
+
+    # Progress writes are SQLite transactions; one writer task keeps them in order and off the loop
+    progress: asyncio.Queue = asyncio.Queue()
+
+    def report(event: dict) -> None:
+        if event["event"] == "update" and event["item_id"] != "trace_id":
+            progress.put_nowait(event["content"])
+
+    async def write_progress() -> None:
+        while (message := await progress.get()) is not None:
+            await asyncio.to_thread(store.update_progress, job.id, message)
+
+    writer = asyncio.create_task(write_progress())
+    try:
+        request = job.request
+        manager = TourManager(
+            cache=caches.research,
+            api_key=api_key,
+            printer=EventPrinter(report),
+            plan_mode=request.get("plan_mode", "agent"),
+            assembly_mode=request.get("assembly_mode", "orchestrator"),
+            prefetch_search=bool(request.get("prefetch_search", False)),
+            search_cache=caches.search,
+            translation_cache=caches.translation,
+        )
+        text, metrics = await manager.run_with_metrics(
+            request["location"], request["interests"], request["duration"], language=request.get("language", "en")
+        )
+        report({"event": "update", "item_id": "audio", "content": "Generating audio..."})
+        pipeline = TTSPipeline(api_key, store=caches.audio, profile=request.get("audio_profile"))
+        audio_path = await pipeline.synthesize_to_store(text, request.get("language", "en"))
+    finally:
+        # Drain before the final status so a late progress message cannot overwrite it
+        progress.put_nowait(None)
+        await writer
+    await asyncio.to_thread(store.complete, job.id, text, audio_path, metrics.to_dict())
+
+
+async def run_worker(db_path: str, concurrency: int = 2, api_key: str | None = None) -> None:
+    """Claim and process jobs forever, up to ``concurrency`` tours at a time."""
+    from agents import set_default_openai_key
+
+    from backends import is_offline
+
+    api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+    if not api_key and not is_offline():
+        raise RuntimeError("Workers need OPENAI_API_KEY in their environment")
+    if api_key:
+        set_default_openai_key(api_key)
+    store = JobStore(db_path)
+    # AudioStore walks its whole directory on open, so open everything once and off the loop
+    caches = await asyncio.to_thread(_open_caches)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    running: set[asyncio.Task] = set()
+
+    async def process(job: Job) -> None:
+        try:
+            await _process_job(store, job, api_key, caches)
+        except Exception as e:
+            await asyncio.to_thread(store.fail, job.id, str(e))
+        finally:
+            semaphore.release()
+
+    while True:
+        await semaphore.acquire()
+        job = await asyncio.to_thread(store.claim, worker_id)
+        if job is None:
+            semaphore.release()
+            await asyncio.sleep(POLL_INTERVAL)
+            continue
+        task = asyncio.create_task(process(job))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+
+def _worker_process(db_path: str, concurrency: int) -> None:
+    asyncio.run(run_worker(db_path, concurrency))
+
+
+class WorkerPool:
+    """A set of worker processes, each running its own event loop over the shared job store."""
+
+    def __init__(self, db_path: str = DEFAULT_JOB_DB, processes: int = 2, concurrency: int = 2) -> None:
+        self.db_path = db_path
+        self.processes = max(1, processes)
+        self.concurrency = concurrency
+        self._workers: list[multiprocessing.Process] = []
+
+    def start(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        for index in range(self.processes):
+            process = context.Process(
+                target=_worker_process,
+                args=(self.db_path, self.concurrency),
+                name=f"sonicguide-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._workers.append(process)
+
+    def join(self) -> None:
+        for process in self._workers:
+            process.join()
+
+    def stop(self) -> None:
+        for process in self._workers:
+            process.terminate()
+        self.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SonicGuide tour job workers")
+    parser.add_argument("--db", default=DEFAULT_JOB_DB, help="Path of the shared SQLite job store")
+    parser.add_argument("--processes", type=int, default=2, help="Worker processes to start")
+    parser.add_argument("--concurrency", type=int, default=2, help="Tours each worker runs at the same time")
+    args = parser.parse_args()
+
+    from backends import is_offline
+
+    if not os.environ.get("OPENAI_API_KEY") and not is_offline():
+        parser.error("OPENAI_API_KEY must be set")
+    JobStore(args.db)  # create the schema before the workers race to do it
+    pool = WorkerPool(args.db, args.processes, args.concurrency)
+    pool.start()
+    try:
+        pool.join()
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
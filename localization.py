@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+# Research and orchestration always run in this language; other languages are translated from it
+PIVOT_LANGUAGE = "en"
+
+LANGUAGE_NAMES = {
+    "en": "English",
+    "fr": "French",
+    "es": "Spanish",
+    "de": "German",
+    "it": "Italian",
+    "zh": "Chinese (Simplified)",
+    "ar": "Arabic",
+    "ur": "Urdu",
+}
+
+
+def language_name(code: str) -> str:
+    return LANGUAGE_NAMES.get(code.lower(), code)
+
+
+def is_pivot(language: str | None) -> bool:
+    return not language or language.lower() == PIVOT_LANGUAGE
+
+
+def split_passages(text: str) -> list[str]:
+    """Paragraphs of a tour: the unit that is translated and cached."""
+    return [passage.strip() for passage in text.split("\n\n") if passage.strip()]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import difflib
+import functools
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+
+DEFAULT_GAZETTEER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.json")
+# difflib ratio a misspelling must reach to be taken as a known place
+DEFAULT_FUZZY_CUTOFF = 0.85
+# Words that qualify a place without changing which place it is ("the colosseum in rome")
+_FILLER_WORDS = {"the", "in", "of", "at", "near", "old", "city", "tour", "visit"}
+
+
+def normalize_location(location: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace so spelling noise maps to one key."""
+    location = re.sub(r"[^\w\s]", " ", location.lower())
+    return " ".join(location.split())
+
+
+@dataclass(frozen=True)
+class Place:
+    id: str
+    name: str
+    city: str = ""
+    country: str = ""
+    aliases: tuple[str, ...] = ()
+
+    @property
+    def display_name(self) -> str:
+        """Unambiguous name for prompts, e.g. "Lahore Fort, Lahore, Pakistan"."""
+        parts = [self.name]
+        for part in (self.city, self.country):
+            if part and part not in parts:
+                parts.append(part)
+        return ", ".join(parts)
+
+
+@dataclass(frozen=True)
+class ResolvedLocation:
+    place_id: str
+    name: str
+    place: Place | None = None
+    match: str = "none"
+    """How the place was found: "exact", "reordered", "qualified", "fuzzy" or "none"."""
+
+
+class PrefixTrie:
+    """Maps normalized names to values and lists every value under a prefix."""
+
+    def __init__(self) -> None:
+        self._root: dict = {}
+
+    def insert(self, key: str, value) -> None:
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault("", []).append(value)
+
+    def search(self, prefix: str, limit: int | None = None) -> list:
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        found, stack = [], [node]
+        while stack and (limit is None or len(found) < limit):
+            node = stack.pop()
+            found.extend(node.get("", []))
+            stack.extend(child for char, child in sorted(node.items(), reverse=True) if char)
+        return found if limit is None else found[:limit]
+
+
+@dataclass
+class _Index:
+    names: dict[str, Place] = field(default_factory=dict)
+    reordered: dict[str, Place] = field(default_factory=dict)
+    trie: PrefixTrie = field(default_factory=PrefixTrie)
+
+
+def _token_key(text: str) -> str:
+    return " ".join(sorted(set(text.split()) - _FILLER_WORDS))
+
+
+class Gazetteer:
+    """
+    Local index of known places. Free text resolves to a canonical place ID by exact name
+    or alias, then by the same words in any order, then after dropping a trailing city or
+    country ("Lahore Fort, Pakistan"), then by fuzzy matching against names that share a
+    prefix. Unknown places keep their normalized text as the ID, so they still cache and
+    de-duplicate across spelling noise.
+    """
+
+    def __init__(self, places: list[Place], fuzzy_cutoff: float = DEFAULT_FUZZY_CUTOFF) -> None:
+        self.places = {place.id: place for place in places}
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._index = _Index()
+        self._qualifiers = set()
+        for place in places:
+            for name in (place.name, place.display_name, *place.aliases):
+                key = normalize_location(name)
+                if key not in self._index.names:
+                    self._index.names[key] = place
+                    self._index.trie.insert(key, key)
+                self._index.reordered.setdefault(_token_key(key), place)
+            self._qualifiers.update(normalize_location(part) for part in (place.city, place.country) if part)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_GAZETTEER) -> "Gazetteer":
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+        return cls([
+            Place(row["id"], row["name"], row.get("city", ""), row.get("country", ""), tuple(row.get("aliases", [])))
+            for row in rows
+        ])
+
+    def resolve(self, text: str) -> ResolvedLocation:
+        key = normalize_location(text)
+        place = self._index.names.get(key)
+        if place is not None:
+            return self._found(place, "exact")
+
+        place = self._index.reordered.get(_token_key(key))
+        if place is not None:
+            return self._found(place, "reordered")
+
+        # Drop trailing qualifiers one at a time: "lahore fort lahore pakistan" -> "lahore fort"
+        words = key.split()
+        while len(words) > 1 and (words[-1] in self._qualifiers or " ".join(words[-2:]) in self._qualifiers):
+            words = words[:-2] if " ".join(words[-2:]) in self._qualifiers else words[:-1]
+            place = self._index.names.get(" ".join(words)) or self._index.reordered.get(_token_key(" ".join(words)))
+            if place is not None:
+                return self._found(place, "qualified")
+
+        place = self._fuzzy(key)
+        if place is not None:
+            return self._found(place, "fuzzy")
+        return ResolvedLocation(place_id="raw:" + key, name=" ".join(text.split()))
+
+    def _fuzzy(self, key: str) -> Place | None:
+        # Names sharing the first letters are the likely misspellings; fall back to every name
+        candidates = self._index.trie.search(key[:2]) or list(self._index.names)
+        matches = difflib.get_close_matches(key, candidates, n=1, cutoff=self.fuzzy_cutoff)
+        if not matches and len(candidates) < len(self._index.names):
+            matches = difflib.get_close_matches(key, list(self._index.names), n=1, cutoff=self.fuzzy_cutoff)
+        return self._index.names[matches[0]] if matches else None
+
+    def suggest(self, prefix: str, limit: int = 8) -> list[Place]:
+        """Known places whose name or alias starts with ``prefix``, for autocomplete."""
+        places = []
+        for key in self._index.trie.search(normalize_location(prefix)):
+            place = self._index.names[key]
+            if place not in places:
+                places.append(place)
+            if len(places) == limit:
+                break
+        return places
+
+    @staticmethod
+    def _found(place: Place, match: str) -> ResolvedLocation:
+        return ResolvedLocation(place_id=place.id, name=place.display_name, place=place, match=match)
+
+
+_gazetteer: Gazetteer | None = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> Gazetteer:
+    """Process-wide gazetteer loaded from the bundled gazetteer.json."""
+    global _gazetteer
+    with _gazetteer_lock:
+        if _gazetteer is None:
+            _gazetteer = Gazetteer.load()
+        return _gazetteer
+
+
+def resolve_location(text: str) -> ResolvedLocation:
+    return get_gazetteer().resolve(text)
+
+
+@functools.lru_cache(maxsize=4096)
+def location_key(text: str) -> str:
+    """Canonical place ID for free text; the key for caches, coalescing, jobs and batches."""
+    return resolve_location(text).place_id
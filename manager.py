@@ -1,21 +1,51 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import re
 import time
 import json
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+
+from openai.types.responses import ResponseTextDeltaEvent
 
 from rich.console import Console
 
-from agents import Runner, RunResult, custom_span, gen_trace_id, trace
+from agents import RunConfig, Runner, RunResult, custom_span, gen_trace_id, trace
 
-from agent import History, historical_agent
-from agent import Culinary, culinary_agent
-from agent import Culture, culture_agent
-from agent import Architecture, architecture_agent
 from agent import Planner, planner_agent
-from agent import FinalTour, orchestrator_agent
-from printer import Printer
+from agent import FinalTour, orchestrator_agent, orchestrator_stream_agent, ORCHESTRATOR_INSTRUCTIONS
+from agent import Continuation, continuation_agent
+from agent import LocationBrief, search_agent
+from agent import Translation, translation_agent
+from agent import TourLinks, transitions_agent
+from assembly import ASSEMBLY_MODES, build_links_prompt, stitch_tour, template_links
+from backends import get_run_config
+from compaction import DEFAULT_MAX_INPUT_TOKENS, compact_sections, count_tokens
+from coalescing import SingleFlight, get_single_flight
+from concurrency import run_in_order
+from metrics import RunMetrics, collect_metrics, current_metrics, timed_stage
+from planning import PLAN_MODES, WORDS_PER_MINUTE, allocate_plan, word_limits_from_plan
+from localization import PIVOT_LANGUAGE, is_pivot, language_name, split_passages
+from interests import Interest, get_interest, resolve_interests, section_order
+from locations import Gazetteer, get_gazetteer, location_key
+from printer import Printer, ProgressSink
+from research_cache import ResearchCache, SearchCache, SessionResearch, TranslationCache
+from routing import FAST_MODEL, with_routing
+from text_utils import count_words, trim_body_to_words, trim_to_words
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_AGENT_TIMEOUT = 180.0
+# Relative gap between provisional and planned word limits that triggers a trim or top-up
+DEFAULT_RECONCILE_THRESHOLD = 0.2
+# Relative distance from a word limit that generated text may drift before it is trimmed or extended
+DEFAULT_WORD_TOLERANCE = 0.1
+# One broad query per location whose notes every specialist shares, whatever the selected interests
+BRIEFING_QUERY = "architecture history culture food"
+BRIEFING_WORDS = 600
+# Pieces this short (one minute of audio) go to the fastest model tier
+DEFAULT_FAST_ROUTE_WORDS = WORDS_PER_MINUTE
 
 
 class TourManager:
@@ -23,13 +53,104 @@ class TourManager:
     Orchestrates the full flow
     """
 
-    def __init__(self) -> None:
-        self.console = Console()
-        self.printer = Printer(self.console)
-
-    async def run(self, query: str, interests: list, duration: str) -> str:
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        agent_timeout: float | None = DEFAULT_AGENT_TIMEOUT,
+        cache: ResearchCache | None = None,
+        plan_mode: str = "agent",
+        reconcile_threshold: float = DEFAULT_RECONCILE_THRESHOLD,
+        run_config: RunConfig | None = None,
+        api_key: str | None = None,
+        printer: ProgressSink | None = None,
+        coalescer: SingleFlight | None = None,
+        assembly_mode: str = "orchestrator",
+        max_input_tokens: int | None = DEFAULT_MAX_INPUT_TOKENS,
+        word_tolerance: float = DEFAULT_WORD_TOLERANCE,
+        session: SessionResearch | None = None,
+        prefetch_search: bool = False,
+        search_cache: SearchCache | None = None,
+        translation_cache: TranslationCache | None = None,
+        gazetteer: Gazetteer | None = None,
+        hedge: bool = True,
+        fast_route_words: int = DEFAULT_FAST_ROUTE_WORDS,
+    ) -> None:
+        # Progress goes to a Rich terminal display unless a sink is given (e.g. NullPrinter for servers)
+        if printer is None:
+            self.console = Console()
+            printer = Printer(self.console)
+        self.printer = printer
+        # Upper bound on specialist agents running at the same time
+        self.max_concurrency = max(1, max_concurrency)
+        # Seconds before a single specialist is abandoned (None waits forever)
+        self.agent_timeout = agent_timeout
+        # Optional persistent research cache; a hit skips the specialist agent call entirely
+        self.cache = cache
+        # Optional per-user memory of earlier sections; reruns reuse or rescale them before any cache or agent
+        self.session = session
+        # With prefetch_search one search agent briefs every specialist, which then writes without its own search
+        self.prefetch_search = prefetch_search
+        self.search_cache = search_cache
+        # Tours in other languages are translated passage by passage from the pivot-language tour
+        self.translation_cache = translation_cache
+        # "agent" asks the planner model for the time split, "local" computes it without a network call,
+        # "speculative" starts research on a local split and reconciles once the planner answers
+        if plan_mode not in PLAN_MODES:
+            raise ValueError(f"Unknown plan mode {plan_mode!r}; expected one of {PLAN_MODES}")
+        self.plan_mode = plan_mode
+        self.reconcile_threshold = reconcile_threshold
+        self.word_tolerance = word_tolerance
+        # Passed to every Runner call, e.g. to route models through a throttled provider.
+        # Otherwise the selected backend decides: the shared pooled client for the API key, or the offline stub.
+        if run_config is None:
+            run_config = get_run_config(api_key)
+        # Calls running past their recent p95 get a duplicate request; the first answer wins
+        if hedge:
+            run_config = with_routing(run_config)
+        self.run_config = run_config
+        # Planner, section and orchestrator calls writing at most this many words use the fastest model
+        self.fast_route_words = fast_route_words
+        # Identical tours and specialist sections requested at the same time share one run
+        self.coalescer = coalescer or get_single_flight()
+        # "orchestrator" rewrites the research into one script; "stitched" and "template" keep the
+        # specialist text verbatim and only generate the intro, transitions and conclusion
+        if assembly_mode not in ASSEMBLY_MODES:
+            raise ValueError(f"Unknown assembly mode {assembly_mode!r}; expected one of {ASSEMBLY_MODES}")
+        self.assembly_mode = assembly_mode
+        # Ceiling on orchestrator prompt tokens; longer research is deduplicated and trimmed (None disables trimming)
+        self.max_input_tokens = max_input_tokens
+        # Free-text locations resolve to a known place so spellings and aliases share caches and runs
+        self.gazetteer = gazetteer or get_gazetteer()
+
+    async def run(
+        self,
+        query: str,
+        interests: list,
+        duration: str,
+        plan_mode: str | None = None,
+        language: str = PIVOT_LANGUAGE,
+    ) -> str:
+        query = self._resolve_location(query)
+        interests = self._resolve_interests(interests)
+        plan_mode = plan_mode or self.plan_mode
+        key = self._tour_key("tour", query, interests, duration, plan_mode)
+        if not self.coalescer.in_flight(key):
+            final_tour = await self.coalescer.do(key, lambda: self._run(query, interests, duration, plan_mode))
+        else:
+            self.printer.update_item("start", "Joining an identical tour that is already being generated...")
+            with timed_stage("Tour") as stage:
+                stage.status = "coalesced"
+                final_tour = await self.coalescer.do(key, lambda: self._run(query, interests, duration, plan_mode))
+
+        if not is_pivot(language):
+            final_tour = await self._translate_tour(final_tour, language)
+        self.printer.update_item("final_report", "Tour generation completed", is_done=True)
+        self.printer.end()
+        return final_tour
+
+    async def _run(self, query: str, interests: list, duration: str, plan_mode: str) -> str:
         trace_id = gen_trace_id()
-        with trace("Tour Research trace", trace_id=trace_id):
+        with trace("Tour Research trace", trace_id=trace_id, disabled=self._tracing_disabled()):
             self.printer.update_item(
                 "trace_id",
                 "View trace: https://platform.openai.com/traces/{}".format(trace_id),
@@ -38,35 +159,7 @@ class TourManager:
             )
             self.printer.update_item("start", "Starting tour research...", is_done=True)
 
-            # Get plan based on selected interests
-            planner = await self._get_plan(query, interests, duration)
-
-            # Initialize research results
-            research_results = {}
-
-            # Calculate word limits based on duration (150 words per minute)
-            words_per_minute = 150
-            total_words = int(duration) * words_per_minute
-
-            # Calculate words for each selected interest
-            num_interests = len(interests)
-            if num_interests > 0:
-                words_per_interest = total_words // num_interests
-            else:
-                words_per_interest = total_words
-
-            # Only research selected interests
-            if "Architecture" in interests:
-                research_results["architecture"] = await self._get_architecture(query, interests, words_per_interest)
-
-            if "History" in interests:
-                research_results["history"] = await self._get_history(query, interests, words_per_interest)
-
-            if "Culinary" in interests:
-                research_results["culinary"] = await self._get_culinary(query, interests, words_per_interest)
-
-            if "Culture" in interests:
-                research_results["culture"] = await self._get_culture(query, interests, words_per_interest)
+            research_results = await self._research(query, interests, duration, plan_mode)
 
             # Get final tour with only selected interests
             final_tour = await self._get_final_tour(
@@ -76,17 +169,463 @@ class TourManager:
                 research_results
             )
 
-            self.printer.update_item("final_report", "Tour generation completed", is_done=True)
-            self.printer.end()
-
             return final_tour.output  # Return the string content for TTS
 
-    async def _get_plan(self, query: str, interests: list, duration: str) -> Planner:
+    async def run_with_metrics(
+        self,
+        query: str,
+        interests: list,
+        duration: str,
+        plan_mode: str | None = None,
+        language: str = PIVOT_LANGUAGE,
+    ) -> tuple[str, RunMetrics]:
+        """Run the tour and return it with per-stage timing, token and cost accounting."""
+        with collect_metrics() as metrics:
+            tour = await self.run(query, interests, duration, plan_mode, language)
+        return tour, metrics
+
+    async def stream(
+        self,
+        query: str,
+        interests: list,
+        duration: str,
+        plan_mode: str | None = None,
+        language: str = PIVOT_LANGUAGE,
+    ) -> AsyncIterator[str]:
+        """
+        Same flow as ``run`` but yields the final tour paragraph by paragraph while the
+        orchestrator is still writing, so TTS can start on the first paragraph early.
+        """
+        query = self._resolve_location(query)
+        interests = self._resolve_interests(interests)
+        plan_mode = plan_mode or self.plan_mode
+        # Identical tours streamed at the same time share one research pass and one orchestrator stream
+        key = self._tour_key("tour-stream", query, interests, duration, plan_mode)
+        joined = self.coalescer.in_flight(key)
+        if joined:
+            self.printer.update_item("start", "Joining an identical tour that is already being generated...")
+        # Like run(), only a follower records a "Tour" stage; the leader records the stages themselves
+        with timed_stage("Tour") if joined else contextlib.nullcontext() as stage:
+            if joined:
+                stage.status = "coalesced"
+            paragraphs = self.coalescer.stream(key, lambda: self._stream_tour(query, interests, duration, plan_mode))
+            if not is_pivot(language):
+                paragraphs = self._translate_stream(paragraphs, language)
+            async for paragraph in paragraphs:
+                yield paragraph
+
+        self.printer.update_item("final_report", "Tour generation completed", is_done=True)
+        self.printer.end()
+
+    async def _stream_tour(self, query: str, interests: list, duration: str, plan_mode: str) -> AsyncIterator[str]:
+        trace_id = gen_trace_id()
+        with trace("Tour Research trace", trace_id=trace_id, disabled=self._tracing_disabled()):
+            self.printer.update_item(
+                "trace_id",
+                "View trace: https://platform.openai.com/traces/{}".format(trace_id),
+                is_done=True,
+                hide_checkmark=True,
+            )
+            self.printer.update_item("start", "Starting tour research...", is_done=True)
+
+            research_results = await self._research(query, interests, duration, plan_mode)
+
+            async for paragraph in self._stream_final_tour(query, interests, duration, research_results):
+                yield paragraph
+
+    def _tour_key(self, kind: str, query: str, interests: list, duration: str, plan_mode: str) -> tuple:
+        # Every language shares one pivot-language tour
+        return (kind, location_key(query), tuple(sorted(interests)), str(duration), plan_mode, self.assembly_mode)
+
+    def _resolve_location(self, query: str) -> str:
+        # Agents get the unambiguous place name ("Lahore Fort, Lahore, Pakistan") rather than the raw text
+        resolved = self.gazetteer.resolve(query)
+        if resolved.place is not None and resolved.name != query.strip():
+            self.printer.update_item("location", f"Touring {resolved.name}", is_done=True)
+        return resolved.name
+
+    def _resolve_interests(self, interests: list) -> list[str]:
+        # UI labels and aliases ("Food") map to registered specialists; unknown ones are reported, not budgeted
+        resolved = resolve_interests(interests)
+        unknown = [name for name in interests if get_interest(name) is None]
+        if unknown:
+            self.printer.update_item("interests", f"Skipping unknown interests: {', '.join(unknown)}", is_done=True)
+        if not resolved:
+            raise ValueError(f"None of the selected interests {interests!r} has a specialist")
+        return resolved
+
+    async def _research(self, query: str, interests: list, duration: str, plan_mode: str) -> dict:
+        if plan_mode == "speculative":
+            return await self._research_speculative(query, interests, duration)
+
+        # The shared search runs alongside the planner
+        briefing = self._start_briefing(query)
+        try:
+            # Get plan based on selected interests; its minutes set each section's word limit
+            planner = await self._get_plan(query, interests, duration, plan_mode)
+        except BaseException:
+            if briefing is not None:
+                briefing.cancel()
+            raise
+        word_limits = word_limits_from_plan(planner, interests, duration)
+
+        specialists = self._select_specialists(interests, word_limits)
+        return await self._run_specialists(query, interests, specialists, briefing)
+
+    async def _research_speculative(self, query: str, interests: list, duration: str) -> dict:
+        """
+        Start the specialists on the local allocation while the planner agent runs, then
+        reconcile each section against the planner's budget. Planner latency is hidden
+        behind research instead of added to it.
+        """
+        provisional = word_limits_from_plan(allocate_plan(interests, duration), interests, duration)
+        plan_task = asyncio.create_task(self._get_plan(query, interests, duration, "agent"))
+
+        specialists = self._select_specialists(interests, provisional)
+        try:
+            research_results = await self._run_specialists(query, interests, specialists, self._start_briefing(query))
+        except BaseException:
+            plan_task.cancel()
+            raise
+
+        try:
+            planner = await plan_task
+        except Exception as e:
+            self.printer.update_item("Planner", f"Planner failed ({e}), keeping provisional budgets", is_done=True)
+            return research_results
+
+        planned = word_limits_from_plan(planner, interests, duration)
+        for name, word_limit in planned.items():
+            content = research_results.get(name.lower())
+            if content is None:
+                continue
+            if abs(word_limit - provisional[name]) <= self.reconcile_threshold * provisional[name]:
+                continue
+            research_results[name.lower()] = await self._reconcile_section(name, query, content, word_limit)
+        return research_results
+
+    async def _reconcile_section(self, name: str, query: str, content: str, word_limit: int) -> str:
+        content = await self._fit_to_word_limit(name, query, content, word_limit)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, query, name, word_limit, content)
+        if self.session is not None:
+            self.session.set(query, name, word_limit, content)
+        return content
+
+    async def _fit_to_word_limit(
+        self, name: str, query: str, content: str, word_limit: int, keep_ending: bool = False
+    ) -> str:
+        """
+        Hold generated text to its word limit without re-running the agent that wrote it.
+        Text over the tolerance is trimmed at sentence boundaries; text under it is extended
+        by a continuation call for only the missing words. ``keep_ending`` protects the last
+        paragraph (the conclusion of a full tour) from both.
+        """
+        words = count_words(content)
+        lowest = word_limit * (1 - self.word_tolerance)
+        highest = word_limit * (1 + self.word_tolerance)
+        if lowest <= words <= highest:
+            return content
+
+        if words > highest:
+            content = trim_body_to_words(content, word_limit) if keep_ending else trim_to_words(content, word_limit)
+            self.printer.update_item(name, f"Trimmed {name.lower()} to {count_words(content)} words", is_done=True)
+            return content
+
+        body, ending = content, ""
+        if keep_ending and "\n\n" in content.strip():
+            body, ending = content.strip().rsplit("\n\n", 1)
+        self.printer.update_item(name, f"Extending {name.lower()} to the planned length...")
+        try:
+            extension = await asyncio.wait_for(
+                self._get_continuation(query, body, word_limit - words), timeout=self.agent_timeout
+            )
+        except Exception as e:
+            self.printer.update_item(name, f"Could not extend {name.lower()} ({e}), keeping it as is", is_done=True)
+            return content
+        # The continuation may overshoot as well
+        extension = trim_to_words(extension, max(1, int(highest) - words))
+        content = f"{body}\n\n{extension}\n\n{ending}" if ending else f"{body} {extension}"
+        self.printer.update_item(name, f"Extended {name.lower()} to {count_words(content)} words", is_done=True)
+        return content
+
+    def _select_specialists(self, interests: list, word_limits: dict) -> dict:
+        # Only research selected interests; specialists are independent so they run concurrently
+        specialists = {}
+        for name in interests:
+            interest = get_interest(name)
+            specialists[interest.name] = (functools.partial(self._get_section, interest), word_limits[interest.name])
+        return specialists
+
+    async def _run_specialists(
+        self, query: str, interests: list, specialists: dict, briefing: asyncio.Task | None = None
+    ) -> dict:
+        """
+        Fan out the selected specialists with bounded concurrency and a per-agent timeout.
+        ``specialists`` maps a section name to its ``(_get_* method, word_limit)`` pair.
+        A specialist that fails or times out is dropped so the tour degrades to the
+        sections that did complete. ``briefing`` resolves to shared search notes, or None
+        when each specialist should search for itself.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def research(name, method, word_limit):
+            notes = await self._briefing_result(query, briefing)
+            async with semaphore:
+                content = await asyncio.wait_for(
+                    method(query, interests, word_limit, notes), timeout=self.agent_timeout
+                )
+            content = await self._fit_to_word_limit(name, query, content, word_limit)
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.set, query, name, word_limit, content)
+            return content
+
+        async def run_specialist(name, method, word_limit):
+            content = await self._get_session_research(name, query, word_limit)
+            if content is None:
+                content = await research_once(name, method, word_limit)
+                if self.session is not None:
+                    self.session.set(query, name, word_limit, content)
+            return content
+
+        async def research_once(name, method, word_limit):
+            content = await shared_research(name, method, word_limit)
+            # Cached and shared sections were written for any limit in the same word bucket
+            fitted = await self._fit_to_word_limit(name, query, content, word_limit)
+            # Keep the longest version, so the words bought to extend it are paid for once;
+            # trimming back down for a smaller limit is free
+            if self.cache is not None and count_words(fitted) > count_words(content):
+                await asyncio.to_thread(self.cache.set, query, name, word_limit, fitted)
+            return fitted
+
+        async def shared_research(name, method, word_limit):
+            cached = await self._get_cached_research(name, query, word_limit)
+            if cached is not None:
+                return cached
+            # Same key as the research cache, so a section in flight is shared exactly like a cached one
+            key = ("research", ResearchCache.make_key(query, name, word_limit))
+            if not self.coalescer.in_flight(key):
+                return await self.coalescer.do(key, lambda: research(name, method, word_limit))
+
+            self.printer.update_item(name, f"Waiting for identical {name.lower()} research already in progress...")
+            with timed_stage(name) as stage:
+                stage.status = "coalesced"
+                content = await self.coalescer.do(key, lambda: research(name, method, word_limit))
+            self.printer.update_item(name, f"Shared {name.lower()} research with another tour", is_done=True)
+            return content
+
+        names = list(specialists)
+        try:
+            outcomes = await asyncio.gather(
+                *(run_specialist(name, *specialists[name]) for name in names),
+                return_exceptions=True,
+            )
+        finally:
+            # Not needed when every section came from the session or the caches
+            if briefing is not None:
+                briefing.cancel()
+
+        research_results = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                if current_metrics() is not None:
+                    current_metrics().stage(name).status = "timeout"
+                self.printer.update_item(name, f"{name} research timed out, skipping section", is_done=True)
+            elif isinstance(outcome, Exception):
+                self.printer.update_item(name, f"{name} research failed ({outcome}), skipping section", is_done=True)
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                research_results[name.lower()] = outcome
+
+        if names and not research_results:
+            raise RuntimeError("All specialist agents failed; no tour content was produced")
+        return research_results
+
+    def _start_briefing(self, query: str) -> asyncio.Task | None:
+        if not self.prefetch_search:
+            return None
+        return asyncio.create_task(self._get_briefing(query))
+
+    async def _briefing_result(self, query: str, briefing: asyncio.Task | None) -> str | None:
+        """
+        The notes of this tour's ``briefing`` for research that other tours may share. The
+        task dies with the tour that started it, so unless it has already finished the
+        notes come from the coalesced search, which runs while anyone still needs it.
+        """
+        if briefing is None:
+            return None
+        if briefing.done() and not briefing.cancelled():
+            return briefing.result()
+        return await self._get_briefing(query)
+
+    async def _get_briefing(self, query: str) -> str | None:
+        """
+        Shared search notes for ``query``: from the search cache, from an identical search
+        already running for another tour, or from one search agent call. None on failure,
+        in which case the specialists fall back to their own web search.
+        """
+        if self.search_cache is not None:
+            notes = await asyncio.to_thread(self.search_cache.get, query, BRIEFING_QUERY)
+            if notes is not None:
+                self.printer.update_item("Search", "Loaded search results from cache", is_done=True)
+                return notes
+
+        async def search():
+            result = await asyncio.wait_for(
+                self._run_agent(
+                    "Search",
+                    search_agent,
+                    "Location: {} | Topics: {} | Word Limit: {} words".format(query, BRIEFING_QUERY, BRIEFING_WORDS),
+                ),
+                timeout=self.agent_timeout,
+            )
+            notes = result.final_output_as(LocationBrief).output
+            if self.search_cache is not None:
+                await asyncio.to_thread(self.search_cache.set, query, BRIEFING_QUERY, notes)
+            return notes
+
+        self.printer.update_item("Search", "Searching the web for the latest information...")
+        key = ("search", location_key(query), SearchCache.normalize_query(BRIEFING_QUERY))
+        try:
+            notes = await self.coalescer.do(key, search)
+        except Exception as e:
+            self.printer.update_item("Search", f"Shared search failed ({e}), specialists will search themselves", is_done=True)
+            return None
+        self.printer.update_item("Search", "Completed web search", is_done=True)
+        return notes
+
+    async def _translate_passage(self, passage: str, language: str) -> str:
+        """
+        One paragraph in ``language``, cached per (passage hash, language) and shared with
+        identical translations in flight. Falls back to the pivot text if translation fails.
+        """
+        if self.translation_cache is not None:
+            cached = await asyncio.to_thread(self.translation_cache.get, passage, language)
+            if cached is not None:
+                return cached
+
+        async def translate():
+            result = await asyncio.wait_for(
+                self._run_agent(
+                    "Translation",
+                    translation_agent,
+                    "Target Language: {}\n\n{}".format(language_name(language), passage),
+                ),
+                timeout=self.agent_timeout,
+            )
+            translation = result.final_output_as(Translation).output
+            if self.translation_cache is not None:
+                await asyncio.to_thread(self.translation_cache.set, passage, language, translation)
+            return translation
+
+        key = ("translate", TranslationCache.text_hash(passage), language)
+        try:
+            return await self.coalescer.do(key, translate)
+        except Exception as e:
+            self.printer.update_item("Translation", f"Could not translate a passage ({e}), keeping the original")
+            return passage
+
+    async def _translate_tour(self, tour: str, language: str) -> str:
+        self.printer.update_item("Translation", f"Translating the tour into {language_name(language)}...")
+        translate = self._bounded_translator(language)
+        passages = await asyncio.gather(*(translate(passage) for passage in split_passages(tour)))
+        self.printer.update_item("Translation", f"Translated the tour into {language_name(language)}", is_done=True)
+        return "\n\n".join(passages)
+
+    def _bounded_translator(self, language: str):
+        # At most max_concurrency translation calls per tour, however many passages there are
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def translate(passage: str) -> str:
+            async with semaphore:
+                return await self._translate_passage(passage, language)
+
+        return translate
+
+    async def _translate_stream(self, paragraphs: AsyncIterator[str], language: str) -> AsyncIterator[str]:
+        # Paragraphs are translated concurrently as they arrive and yielded in their original order
+        self.printer.update_item("Translation", f"Translating the tour into {language_name(language)}...")
+        translate = self._bounded_translator(language)
+        async for passage in run_in_order(translate(paragraph) async for paragraph in paragraphs):
+            yield passage
+        self.printer.update_item("Translation", f"Translated the tour into {language_name(language)}", is_done=True)
+
+    def _briefing_notes(self, briefing: str | None) -> str:
+        return f"\n\nResearch notes:\n{briefing}" if briefing else ""
+
+    async def _run_agent(self, stage_name: str, agent, input: str, words: int | None = None) -> RunResult:
+        # Every agent call goes through here so its latency and token usage land in RunMetrics
+        agent = self._route(agent, words)
+        with timed_stage(stage_name) as stage:
+            result = await Runner.run(agent, input, run_config=self.run_config)
+            stage.add_usage(self._model_name(agent), result.raw_responses)
+        return result
+
+    def _route(self, agent, words: int | None):
+        # A short piece gains little from a larger model but still waits on its slower responses
+        if words is not None and words <= self.fast_route_words and agent.model not in (None, FAST_MODEL):
+            return agent.clone(model=FAST_MODEL)
+        return agent
+
+    def _tracing_disabled(self) -> bool:
+        return self.run_config is not None and self.run_config.tracing_disabled
+
+    def _model_name(self, agent) -> str | None:
+        if self.run_config is not None and isinstance(self.run_config.model, str):
+            return self.run_config.model
+        return agent.model if isinstance(agent.model, str) else None
+
+    async def _get_session_research(self, name: str, query: str, word_limit: int) -> str | None:
+        """
+        A section researched earlier in this session, rescaled to the new word limit. The
+        longest version is kept, so shrinking and then growing a tour only needs the words
+        that were never written.
+        """
+        previous = self.session.get(query, name) if self.session is not None else None
+        if previous is None:
+            return None
+        previous_limit, previous_content = previous
+        with timed_stage(name) as stage:
+            stage.status = "reused"
+        if previous_limit == word_limit:
+            self.printer.update_item(name, f"Reused {name.lower()} from this session", is_done=True)
+            return previous_content
+
+        content = await self._fit_to_word_limit(name, query, previous_content, word_limit)
+        if content is previous_content:
+            self.printer.update_item(name, f"Reused {name.lower()} from this session", is_done=True)
+        if count_words(content) >= count_words(previous_content):
+            self.session.set(query, name, word_limit, content)
+        return content
+
+    async def _get_cached_research(self, name: str, query: str, word_limit: int) -> str | None:
+        if self.cache is None:
+            return None
+        # Every lookup writes accessed_at and commits; keep SQLite off the loop every session shares
+        content = await asyncio.to_thread(self.cache.get, query, name, word_limit)
+        if content is not None:
+            with timed_stage(name) as stage:
+                stage.status = "cached"
+            self.printer.update_item(name, f"Loaded {name.lower()} research from cache", is_done=True)
+        return content
+
+    async def _get_plan(self, query: str, interests: list, duration: str, plan_mode: str = "agent") -> Planner:
+        if plan_mode not in PLAN_MODES:
+            raise ValueError(f"Unknown plan mode {plan_mode!r}; expected one of {PLAN_MODES}")
+        if plan_mode == "local":
+            self.printer.update_item("Planner", "Planned tour locally", is_done=True)
+            return allocate_plan(interests, duration)
+
         self.printer.update_item("Planner", "Planning your personalized tour...")
-        result = await Runner.run(
+        # Tours that differ only in language or assembly share one planner call
+        key = ("plan", location_key(query), tuple(sorted(interests)), str(duration))
+        result = await self.coalescer.do(key, lambda: self._run_agent(
+            "Planner",
             planner_agent,
-            "Location: {} | Interests: {} | Duration: {} minutes".format(query, ', '.join(interests), duration)
-        )
+            "Location: {} | Interests: {} | Duration: {} minutes".format(query, ', '.join(interests), duration),
+            words=int(float(duration) * WORDS_PER_MINUTE),
+        ))
         self.printer.update_item(
             "Planner",
             "Completed planning",
@@ -94,79 +633,62 @@ class TourManager:
         )
         return result.final_output_as(Planner)
 
-    async def _get_history(self, query: str, interests: list, word_limit: int) -> str:
-        self.printer.update_item("History", "Researching historical highlights...")
-        result = await Runner.run(
-            historical_agent,
-            "Location: {} | Interests: {} | Word Limit: {} words. Create engaging historical content for an audio tour. Focus on interesting stories and personal connections. Make it conversational and natural for speech.".format(
-                query, ', '.join(interests), word_limit)
+    async def _get_section(
+        self, interest: Interest, query: str, interests: list, word_limit: int, briefing: str | None = None
+    ) -> str:
+        name = interest.name
+        self.printer.update_item(name, interest.progress_message)
+        agent, output_type = interest.specialist(briefed=bool(briefing))
+        result = await self._run_agent(
+            name,
+            agent,
+            interest.build_prompt(query, interests, word_limit) + self._briefing_notes(briefing),
+            words=word_limit,
         )
         self.printer.update_item(
-            "History",
-            "Completed history research",
+            name,
+            f"Completed {name.lower()} research",
             is_done=True,
         )
-        history_output = result.final_output_as(History)
-        return history_output.output
-
-    async def _get_architecture(self, query: str, interests: list, word_limit: int) -> str:
-        self.printer.update_item("Architecture", "Exploring architectural wonders...")
-        result = await Runner.run(
-            architecture_agent,
-            "Location: {} | Interests: {} | Word Limit: {} words. Create engaging architectural content for an audio tour. Focus on visual descriptions and interesting design details. Make it conversational and natural for speech.".format(
-                query, ', '.join(interests), word_limit)
-        )
-        self.printer.update_item(
-            "Architecture",
-            "Completed architecture research",
-            is_done=True,
-        )
-        arch_output = result.final_output_as(Architecture)
-        return arch_output.output
-
-    async def _get_culinary(self, query: str, interests: list, word_limit: int) -> str:
-        self.printer.update_item("Culinary", "Discovering local flavors...")
-        result = await Runner.run(
-            culinary_agent,
-            "Location: {} | Interests: {} | Word Limit: {} words. Create engaging culinary content for an audio tour. Focus on local specialties and food stories. Make it conversational and natural for speech.".format(
-                query, ', '.join(interests), word_limit)
-        )
-        self.printer.update_item(
-            "Culinary",
-            "Completed culinary research",
-            is_done=True,
-        )
-        culinary_output = result.final_output_as(Culinary)
-        return culinary_output.output
-
-    async def _get_culture(self, query: str, interests: list, word_limit: int) -> str:
-        self.printer.update_item("Culture", "Exploring cultural highlights...")
-        result = await Runner.run(
-            culture_agent,
-            "Location: {} | Interests: {} | Word Limit: {} words. Create engaging cultural content for an audio tour. Focus on local traditions and community life. Make it conversational and natural for speech.".format(
-                query, ', '.join(interests), word_limit)
-        )
-        self.printer.update_item(
-            "Culture",
-            "Completed culture research",
-            is_done=True,
+        return result.final_output_as(output_type).output
+
+    async def _get_continuation(self, query: str, content: str, extra_words: int) -> str:
+        result = await self._run_agent(
+            "Continuation",
+            continuation_agent,
+            "Location: {} | Extra Words: {} words\n\nExisting section:\n{}".format(query, extra_words, content)
         )
-        culture_output = result.final_output_as(Culture)
-        return culture_output.output
+        return result.final_output_as(Continuation).output
+
+    def _compact_sections(self, sections: list[tuple[str, str]], overhead_tokens: int) -> list[tuple[str, str]]:
+        # Repeated facts are dropped and the research is held under the orchestrator's input ceiling
+        model = self._model_name(orchestrator_agent) or "gpt-4o-mini"
+        budget = None if self.max_input_tokens is None else max(0, self.max_input_tokens - overhead_tokens)
+        sections, stats = compact_sections(sections, budget, model)
+        if stats.tokens_after < stats.tokens_before:
+            self.printer.update_item(
+                "Compaction",
+                f"Compacted research from {stats.tokens_before} to {stats.tokens_after} tokens",
+                is_done=True,
+            )
+        return sections
 
-    async def _get_final_tour(self, query: str, interests: list, duration: float, research_results: dict) -> FinalTour:
-        self.printer.update_item("Final Tour", "Creating your personalized tour...")
+    def _build_final_tour_prompt(self, query: str, interests: list, duration: float, research_results: dict) -> str:
+        sections = [
+            (section, research_results[section.lower()])
+            for section in section_order()
+            if section.lower() in research_results
+        ]
+        overhead = count_tokens(ORCHESTRATOR_INSTRUCTIONS + self._render_final_tour_prompt(query, interests, duration, ""))
+        sections = self._compact_sections(sections, overhead)
 
         # Build content sections string for the orchestrator
-        content_sections = []
-        for interest in interests:
-            interest_lower = interest.lower()
-            if interest_lower in research_results:
-                content_sections.append(f"{interest} Content:\n{research_results[interest_lower]}")
+        sections_text = "\n\n".join(f"{section} Content:\n{content}" for section, content in sections)
+        return self._render_final_tour_prompt(query, interests, duration, sections_text)
 
+    def _render_final_tour_prompt(self, query: str, interests: list, duration: float, sections_text: str) -> str:
         # Calculate total words based on duration
-        words_per_minute = 150
-        total_words = int(duration) * words_per_minute
+        total_words = int(duration) * WORDS_PER_MINUTE
 
         prompt = f"""
         Location: {query}
@@ -175,7 +697,7 @@ class TourManager:
         Target Word Count: {total_words} words
 
         Content from Specialists:
-        {'\n\n'.join(content_sections)}
+        {sections_text}
 
         Please create a natural, conversational audio tour that flows smoothly. 
         Include an engaging introduction and thoughtful conclusion.
@@ -183,12 +705,94 @@ class TourManager:
         Use natural transitions and maintain a conversational tone throughout.
         The total content should be approximately {total_words} words.
         """
+        return prompt
+
+    async def _assemble_tour(self, query: str, interests: list, duration: float, research_results: dict) -> str:
+        """
+        Keep the specialist sections verbatim and surround them with a generated intro,
+        transitions and conclusion, so generated tokens scale with the number of sections.
+        """
+        sections = [
+            (section, research_results[section.lower()])
+            for section in section_order()
+            if section.lower() in research_results
+        ]
+        fallback = template_links(query, duration, [name for name, _ in sections])
+        if self.assembly_mode == "template":
+            self.printer.update_item("Final Tour", "Assembled the tour from the specialist sections", is_done=True)
+            return stitch_tour(fallback, sections)
+
+        self.printer.update_item("Final Tour", "Writing the introduction and transitions...")
+        try:
+            result = await asyncio.wait_for(
+                self._run_agent(
+                    "Transitions", transitions_agent, build_links_prompt(query, interests, duration, sections)
+                ),
+                timeout=self.agent_timeout,
+            )
+            links = result.final_output_as(TourLinks)
+        except Exception as e:
+            self.printer.update_item("Final Tour", f"Transitions failed ({e}), using standard ones", is_done=True)
+            return stitch_tour(fallback, sections)
 
-        result = await Runner.run(orchestrator_agent, prompt)
+        self.printer.update_item("Final Tour", "Completed Final Tour Guide Creation", is_done=True)
+        return stitch_tour(links, sections, fallback)
+
+    async def _get_final_tour(self, query: str, interests: list, duration: float, research_results: dict) -> FinalTour:
+        if self.assembly_mode != "orchestrator":
+            return FinalTour(output=await self._assemble_tour(query, interests, duration, research_results))
+
+        self.printer.update_item("Final Tour", "Creating your personalized tour...")
+        prompt = self._build_final_tour_prompt(query, interests, duration, research_results)
+
+        result = await self._run_agent(
+            "Orchestrator", orchestrator_agent, prompt, words=int(float(duration) * WORDS_PER_MINUTE)
+        )
 
         self.printer.update_item(
             "Final Tour",
             "Completed Final Tour Guide Creation",
             is_done=True,
         )
-        return result.final_output_as(FinalTour)
\ No newline at end of file
+        final_tour = result.final_output_as(FinalTour)
+        total_words = int(duration) * WORDS_PER_MINUTE
+        final_tour.output = await self._fit_to_word_limit(
+            "Final Tour", query, final_tour.output, total_words, keep_ending=True
+        )
+        return final_tour
+
+    async def _stream_final_tour(
+        self, query: str, interests: list, duration: float, research_results: dict
+    ) -> AsyncIterator[str]:
+        if self.assembly_mode != "orchestrator":
+            tour = await self._assemble_tour(query, interests, duration, research_results)
+            for paragraph in tour.split("\n\n"):
+                yield paragraph
+            return
+
+        self.printer.update_item("Final Tour", "Creating your personalized tour...")
+        prompt = self._build_final_tour_prompt(query, interests, duration, research_results)
+        prompt += "\nSeparate paragraphs with a blank line."
+
+        agent = self._route(orchestrator_stream_agent, int(float(duration) * WORDS_PER_MINUTE))
+        with timed_stage("Orchestrator") as stage:
+            result = Runner.run_streamed(agent, prompt, run_config=self.run_config)
+            buffer = ""
+            async for event in result.stream_events():
+                if event.type != "raw_response_event" or not isinstance(event.data, ResponseTextDeltaEvent):
+                    continue
+                buffer += event.data.delta
+                # Everything before the last newline is a finished paragraph
+                *paragraphs, buffer = re.split(r"\n+", buffer)
+                for paragraph in paragraphs:
+                    if paragraph.strip():
+                        yield paragraph.strip()
+            if buffer.strip():
+                yield buffer.strip()
+            stage.add_usage(self._model_name(agent), result.raw_responses)
+
+        self.printer.update_item(
+            "Final Tour",
+            "Completed Final Tour Guide Creation",
+            is_done=True,
+        )
\ No newline at end of file
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+# USD per 1M tokens (input, output); TTS models are priced per 1M characters
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+TTS_PRICES = {
+    "tts-1": 15.00,
+    "tts-1-hd": 30.00,
+}
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile, ``q`` in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    seconds: float = 0.0
+    calls: int = 0
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    characters: int = 0
+    cost_usd: float = 0.0
+    status: str = "ok"
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def add_usage(self, model, raw_responses) -> None:
+        """Add token usage from a run's ``raw_responses`` and price it by model name."""
+        input_tokens = sum(response.usage.input_tokens for response in raw_responses)
+        output_tokens = sum(response.usage.output_tokens for response in raw_responses)
+        self.requests += sum(response.usage.requests for response in raw_responses)
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+        self.cost_usd += (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+    def add_characters(self, model: str, characters: int) -> None:
+        self.requests += 1
+        self.characters += characters
+        self.cost_usd += characters * TTS_PRICES.get(model, 0.0) / 1_000_000
+
+
+@dataclass
+class RunMetrics:
+    """Per-stage wall time, token usage and estimated cost for one tour."""
+
+    stages: dict[str, StageMetrics] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.perf_counter)
+    total_seconds: float = 0.0
+
+    def stage(self, name: str) -> StageMetrics:
+        if name not in self.stages:
+            self.stages[name] = StageMetrics(name)
+        return self.stages[name]
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(stage.input_tokens for stage in self.stages.values())
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(stage.output_tokens for stage in self.stages.values())
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(stage.cost_usd for stage in self.stages.values())
+
+    def finish(self) -> None:
+        self.total_seconds = time.perf_counter() - self.started_at
+
+    def to_dict(self) -> dict:
+        return {
+            "total_seconds": round(self.total_seconds, 3),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "stages": {
+                name: {key: value for key, value in asdict(stage).items() if key not in ("started_at", "finished_at")}
+                for name, stage in self.stages.items()
+            },
+        }
+
+
+_current: contextvars.ContextVar[RunMetrics | None] = contextvars.ContextVar("sonicguide_metrics", default=None)
+
+
+def current_metrics() -> RunMetrics | None:
+    return _current.get()
+
+
+@contextmanager
+def collect_metrics():
+    """Collect metrics for every stage run inside this block, including tasks it spawns."""
+    metrics = RunMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        metrics.finish()
+        _current.reset(token)
+
+
+@contextmanager
+def timed_stage(name: str):
+    """
+    Time one call of a stage. Repeated calls (e.g. TTS chunks) widen the stage's wall-clock
+    span instead of adding up, so concurrent calls are not double counted. Yields the
+    StageMetrics to add usage to, or a throwaway one when no metrics are being collected.
+    """
+    metrics = _current.get()
+    stage = metrics.stage(name) if metrics is not None else StageMetrics(name)
+    started = time.perf_counter()
+    if stage.started_at is None or started < stage.started_at:
+        stage.started_at = started
+    try:
+        yield stage
+    except BaseException as e:
+        stage.status = "cancelled" if isinstance(e, asyncio.CancelledError) else "failed"
+        raise
+    finally:
+        stage.calls += 1
+        finished = time.perf_counter()
+        if stage.finished_at is None or finished > stage.finished_at:
+            stage.finished_at = finished
+        stage.seconds = stage.finished_at - stage.started_at
@@ -0,0 +1,43 @@
+from agent import Planner
+
+WORDS_PER_MINUTE = 150
+
+# Sections the planner can allocate time to, besides the introduction and conclusion
+PLANNED_SECTIONS = ["architecture", "history", "culture", "culinary"]
+
+PLAN_MODES = ("agent", "local", "speculative")
+
+
+def allocate_plan(interests: list, duration: float) -> Planner:
+    """
+    Deterministic local stand-in for the planner agent: reserve up to 1.5 minutes for the
+    introduction and 1 minute for the conclusion, then split the rest evenly across the
+    selected sections.
+    """
+    duration = float(duration)
+    introduction = min(1.5, duration * 0.1)
+    conclusion = min(1.0, duration * 0.05)
+    selected = [interest.lower() for interest in interests]
+    body = max(0.0, duration - introduction - conclusion)
+    per_section = body / len(selected) if selected else 0.0
+
+    return Planner(
+        introduction=round(introduction, 2),
+        conclusion=round(conclusion, 2),
+        **{section: round(per_section if section in selected else 0.0, 2) for section in PLANNED_SECTIONS},
+    )
+
+
+def word_limits_from_plan(plan: Planner, interests: list, duration: float) -> dict:
+    """
+    Turn the planner's minutes into a word limit for each selected section. Sections the
+    plan left empty, including interests the Planner model has no field for, fall back to
+    an even share so no selected interest goes unresearched.
+    """
+    fallback = int(float(duration) * WORDS_PER_MINUTE) // max(1, len(interests))
+
+    word_limits = {}
+    for interest in interests:
+        minutes = getattr(plan, interest.lower(), 0.0)
+        word_limits[interest] = int(round(minutes * WORDS_PER_MINUTE)) if minutes > 0 else fallback
+    return word_limits
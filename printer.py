@@ -1,3 +1,6 @@
+import threading
+import time
+from collections.abc import Callable
 from typing import Any
 
 from rich.console import Console, Group
@@ -5,42 +8,121 @@ from rich.live import Live
 from rich.spinner import Spinner
 
 
-class Printer:
+class ProgressSink:
+    """
+    Interface for progress updates from TourManager. The base class discards every
+    update, which makes it the headless sink for server deployments.
+    """
+
+    def update_item(
+        self, item_id: str, content: str, is_done: bool = False, hide_checkmark: bool = False
+    ) -> None:
+        pass
+
+    def mark_item_done(self, item_id: str) -> None:
+        pass
+
+    def hide_done_checkmark(self, item_id: str) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+class NullPrinter(ProgressSink):
+    """Headless sink: no console, no rendering."""
+
+
+class Printer(ProgressSink):
     """
     Simple wrapper to stream status updates. Used by the financial bot
     manager as it orchestrates planning, search and writing.
+
+    Updates only change state; Rich redraws the spinners at most ``refresh_per_second``
+    times from its own thread, so bursts of updates are coalesced into one render.
     """
 
-    def __init__(self, console: Console) -> None:
-        self.live = Live(console=console)
+    def __init__(self, console: Console, refresh_per_second: float = 4) -> None:
         self.items: dict[str, tuple[str, bool]] = {}
         self.hide_done_ids: set[str] = set()
-        self.live.start()
+        # Spinners are kept between renders so their animation keeps running
+        self._spinners: dict[str, Spinner] = {}
+        self._lock = threading.Lock()
+        self._started = False
+        self.live = Live(console=console, get_renderable=self._render, refresh_per_second=refresh_per_second)
 
     def end(self) -> None:
-        self.live.stop()
+        if self._started:
+            self.live.stop()
+            self._started = False
 
     def hide_done_checkmark(self, item_id: str) -> None:
-        self.hide_done_ids.add(item_id)
+        with self._lock:
+            self.hide_done_ids.add(item_id)
 
     def update_item(
         self, item_id: str, content: str, is_done: bool = False, hide_checkmark: bool = False
     ) -> None:
-        self.items[item_id] = (content, is_done)
-        if hide_checkmark:
-            self.hide_done_ids.add(item_id)
-        self.flush()
+        with self._lock:
+            self.items[item_id] = (content, is_done)
+            if hide_checkmark:
+                self.hide_done_ids.add(item_id)
+        self._ensure_started()
 
     def mark_item_done(self, item_id: str) -> None:
-        self.items[item_id] = (self.items[item_id][0], True)
-        self.flush()
+        with self._lock:
+            self.items[item_id] = (self.items[item_id][0], True)
+        self._ensure_started()
 
     def flush(self) -> None:
+        self.live.refresh()
+
+    def _ensure_started(self) -> None:
+        # The Live display is only started once there is something to show
+        if not self._started:
+            self._started = True
+            self.live.start()
+
+    def _render(self) -> Group:
         renderables: list[Any] = []
-        for item_id, (content, is_done) in self.items.items():
-            if is_done:
-                prefix = "✅ " if item_id not in self.hide_done_ids else ""
-                renderables.append(prefix + content)
-            else:
-                renderables.append(Spinner("dots", text=content))
-        self.live.update(Group(*renderables))
+        with self._lock:
+            for item_id, (content, is_done) in self.items.items():
+                if is_done:
+                    prefix = "✅ " if item_id not in self.hide_done_ids else ""
+                    renderables.append(prefix + content)
+                else:
+                    spinner = self._spinners.get(item_id)
+                    if spinner is None:
+                        spinner = self._spinners[item_id] = Spinner("dots", text=content)
+                    else:
+                        spinner.update(text=content)
+                    renderables.append(spinner)
+        return Group(*renderables)
+
+
+class EventPrinter(ProgressSink):
+    """
+    Structured sink: every update becomes an event dict that is kept in ``events`` and,
+    if given, passed to ``callback`` (e.g. to forward progress to a job store or a UI).
+    """
+
+    def __init__(self, callback: Callable[[dict], None] | None = None) -> None:
+        self.callback = callback
+        self.events: list[dict] = []
+
+    def _emit(self, event: dict) -> None:
+        event["time"] = time.time()
+        self.events.append(event)
+        if self.callback is not None:
+            self.callback(event)
+
+    def update_item(
+        self, item_id: str, content: str, is_done: bool = False, hide_checkmark: bool = False
+    ) -> None:
+        self._emit({"event": "update", "item_id": item_id, "content": content, "is_done": is_done})
+
+    def mark_item_done(self, item_id: str) -> None:
+        self._emit({"event": "done", "item_id": item_id})
+
+    def end(self) -> None:
+        self._emit({"event": "end"})
@@ -0,0 +1,244 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from locations import location_key, normalize_location
+
+DEFAULT_CACHE_DIR = os.environ.get("SONICGUIDE_CACHE_DIR", ".sonicguide_cache")
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Search results go stale faster than written research (opening hours, events, closures)
+DEFAULT_SEARCH_TTL_SECONDS = 24 * 60 * 60
+
+# Word limits are bucketed so that nearby durations share an entry (150 words = 1 minute of audio)
+WORD_BUCKET_SIZE = 150
+
+
+def word_bucket(word_limit: int) -> int:
+    return max(1, -(-int(word_limit) // WORD_BUCKET_SIZE))
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ResearchCache:
+    """
+    On-disk SQLite cache of specialist research, keyed on the canonical place ID,
+    the specialist name and a word-limit bucket. Entries expire after ``ttl`` seconds
+    and the least recently used ones are evicted once the store exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "research.sqlite3")
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS research (
+                key TEXT PRIMARY KEY,
+                location TEXT NOT NULL,
+                specialist TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS research_accessed ON research (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(location: str, specialist: str, word_limit: int) -> str:
+        return "{}|{}|{}".format(location_key(location), specialist.lower(), word_bucket(word_limit))
+
+    def get(self, location: str, specialist: str, word_limit: int) -> str | None:
+        return self.get_entry(self.make_key(location, specialist, word_limit))
+
+    def set(self, location: str, specialist: str, word_limit: int, content: str) -> None:
+        self.set_entry(
+            self.make_key(location, specialist, word_limit),
+            content,
+            location_key(location),
+            specialist.lower(),
+            word_bucket(word_limit),
+        )
+
+    def get_entry(self, key: str) -> str | None:
+        """Look up an entry by its raw key, for callers with their own key scheme."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM research WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM research WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.stats.misses += 1
+                return None
+            self._conn.execute("UPDATE research SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.stats.hits += 1
+            return row[0]
+
+    def set_entry(self, key: str, content: str, location: str = "", specialist: str = "", bucket: int = 0) -> None:
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO research
+                    (key, location, specialist, bucket, content, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, location, specialist, bucket, content, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        self._conn.execute("DELETE FROM research WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM research").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM research ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM research WHERE key = ?", (key,))
+            total -= size
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM research")
+            self._conn.commit()
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM research"
+            ).fetchone()
+        self.stats.entries = entries
+        self.stats.bytes = total
+        return self.stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SearchCache:
+    """
+    Web search briefings shared by every tour, keyed on the canonical place ID and query
+    (word order ignored). Stored like research in its own SQLite file with a shorter TTL.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl: float = DEFAULT_SEARCH_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "search.sqlite3")
+        self._store = ResearchCache(path, ttl, max_bytes)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(sorted(normalize_location(query).split()))
+
+    def get(self, location: str, query: str) -> str | None:
+        return self._store.get(location, self.normalize_query(query), 0)
+
+    def set(self, location: str, query: str, content: str) -> None:
+        self._store.set(location, self.normalize_query(query), 0, content)
+
+    def get_stats(self) -> CacheStats:
+        return self._store.get_stats()
+
+    def close(self) -> None:
+        self._store.close()
+
+
+class TranslationCache:
+    """
+    Translated tour passages keyed on a hash of the source text and the target language,
+    so a passage shared by many tours (or many runs of one tour) is translated once.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "translations.sqlite3")
+        self._store = ResearchCache(path, ttl, max_bytes)
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+    def make_key(self, text: str, language: str) -> str:
+        # Keyed directly: a text hash is not a location, so it skips the gazetteer entirely
+        return "{}|{}".format(self.text_hash(text), language.lower())
+
+    def get(self, text: str, language: str) -> str | None:
+        return self._store.get_entry(self.make_key(text, language))
+
+    def set(self, text: str, language: str, translation: str) -> None:
+        self._store.set_entry(self.make_key(text, language), translation, self.text_hash(text), language.lower())
+
+    def get_stats(self) -> CacheStats:
+        return self._store.get_stats()
+
+    def close(self) -> None:
+        self._store.close()
+
+
+class SessionResearch:
+    """
+    In-memory research from earlier tours in one user session, keyed on the canonical
+    place ID and specialist together with the exact word limit each section was written
+    for. When the user changes interests or duration, the next run reuses these sections
+    or rescales them instead of researching them again.
+    """
+
+    def __init__(self) -> None:
+        self._sections: dict[tuple[str, str], tuple[int, str]] = {}
+
+    def get(self, location: str, specialist: str) -> tuple[int, str] | None:
+        return self._sections.get((location_key(location), specialist.lower()))
+
+    def set(self, location: str, specialist: str, word_limit: int, content: str) -> None:
+        self._sections[(location_key(location), specialist.lower())] = (word_limit, content)
+
+    def clear(self) -> None:
+        self._sections.clear()
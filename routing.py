@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from agents import Model, ModelProvider, ModelResponse, OpenAIProvider, RunConfig
+
+from metrics import percentile
+
+# Model tiers from fastest to most capable; short sections are routed to the first
+MODEL_TIERS = ("gpt-4o-mini", "gpt-4o")
+FAST_MODEL = MODEL_TIERS[0]
+# A call still running at this percentile of its kind's recent latency gets a duplicate
+DEFAULT_HEDGE_PERCENTILE = 95
+# Calls of a kind needed before its percentile is trusted; until then nothing is hedged
+DEFAULT_MIN_SAMPLES = 10
+DEFAULT_WINDOW = 100
+# Duplicates allowed per call, so a slow provider is not hit with twice the load
+DEFAULT_MAX_HEDGE_RATIO = 0.2
+
+
+def latency_key(model_name: str | None, output_schema) -> str:
+    # Output types differ wildly in length (a plan vs a whole tour), so each gets its own percentiles
+    output = output_schema.output_type_name() if output_schema is not None else "str"
+    return f"{model_name or 'default'}:{output}"
+
+
+@dataclass
+class RoutingStats:
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+
+
+class LatencyTracker:
+    """
+    Rolling latencies per model and output type, and the hedge budget, shared by every
+    tour in the process.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, min_samples: int = DEFAULT_MIN_SAMPLES) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self.stats = RoutingStats()
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: str, q: float) -> float | None:
+        with self._lock:
+            samples = list(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return percentile(samples, q)
+
+    def count_call(self) -> None:
+        with self._lock:
+            self.stats.calls += 1
+
+    def allow_hedge(self, max_ratio: float) -> bool:
+        """Take one duplicate from the budget unless that would put more than ``max_ratio`` of calls over it."""
+        with self._lock:
+            if self.stats.hedged + 1 > max_ratio * self.stats.calls:
+                return False
+            self.stats.hedged += 1
+            return True
+
+    def count_hedge_win(self) -> None:
+        with self._lock:
+            self.stats.hedge_wins += 1
+
+    def get_stats(self) -> RoutingStats:
+        with self._lock:
+            return RoutingStats(**vars(self.stats))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+        return {
+            key: {"p50": percentile(values, 50), "p95": percentile(values, 95), "samples": len(values)}
+            for key, values in samples.items()
+        }
+
+
+_tracker: LatencyTracker | None = None
+_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LatencyTracker()
+        return _tracker
+
+
+async def _first_success(tasks: list[asyncio.Task]) -> asyncio.Task:
+    """The first task to finish without an error; raises the first error if every task fails."""
+    pending = set(tasks)
+    error = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                return task
+            error = error or task.exception()
+    raise error
+
+
+class HedgedModel(Model):
+    """
+    Wraps a model so a call still running past its kind's p95 gets a duplicate request;
+    whichever answers first wins and the other is cancelled.
+    """
+
+    def __init__(self, model: Model, model_name: str | None, router: RoutingModelProvider) -> None:
+        self.model = model
+        self.model_name = model_name
+        self.router = router
+
+    async def _timed(self, key: str, args: tuple, primary: bool = True) -> ModelResponse:
+        started = time.perf_counter()
+        try:
+            response = await self.model.get_response(*args)
+        except asyncio.CancelledError:
+            # A call cut short took at least this long; leaving it out would pull p95 down
+            # just as calls get slow. A losing duplicate only says less than the winner did.
+            if primary:
+                self.router.tracker.record(key, time.perf_counter() - started)
+            raise
+        self.router.tracker.record(key, time.perf_counter() - started)
+        return response
+
+    async def get_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing
+    ) -> ModelResponse:
+        args = (system_instructions, input, model_settings, tools, output_schema, handoffs, tracing)
+        key = latency_key(self.model_name, output_schema)
+        delay = self.router.hedge_delay(key)
+        self.router.tracker.count_call()
+
+        tasks = [asyncio.create_task(self._timed(key, args))]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self.router.allow_hedge():
+                    tasks.append(asyncio.create_task(self._timed(key, args, primary=False)))
+            winner = await _first_success(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if winner is not tasks[0]:
+            self.router.tracker.count_hedge_win()
+        return winner.result()
+
+    async def stream_response(self, *args, **kwargs) -> AsyncIterator:
+        # Streams are not hedged: events may already have reached the caller
+        async for event in self.model.stream_response(*args, **kwargs):
+            yield event
+
+
+class RoutingModelProvider(ModelProvider):
+    """
+    Model provider that hedges slow calls. Latency percentiles and the hedge budget live on
+    a process-wide LatencyTracker, so every tour benefits from what earlier tours observed
+    and all of them together stay within ``max_hedge_ratio``.
+    """
+
+    def __init__(
+        self,
+        provider: ModelProvider | None = None,
+        tracker: LatencyTracker | None = None,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        max_hedge_ratio: float = DEFAULT_MAX_HEDGE_RATIO,
+    ) -> None:
+        self.provider = provider or OpenAIProvider()
+        self.tracker = tracker or get_latency_tracker()
+        self.hedge_percentile = hedge_percentile
+        self.max_hedge_ratio = max_hedge_ratio
+
+    def get_model(self, model_name: str | None) -> Model:
+        return HedgedModel(self.provider.get_model(model_name), model_name, self)
+
+    def hedge_delay(self, key: str) -> float | None:
+        """Seconds to wait before hedging a call of this kind, or None while there is too little history."""
+        return self.tracker.percentile(key, self.hedge_percentile)
+
+    @property
+    def stats(self) -> RoutingStats:
+        return self.tracker.get_stats()
+
+    def allow_hedge(self) -> bool:
+        return self.tracker.allow_hedge(self.max_hedge_ratio)
+
+
+def with_routing(run_config: RunConfig | None, **kwargs) -> RunConfig:
+    """``run_config`` with its model provider wrapped for hedging (a default RunConfig when None)."""
+    run_config = run_config or RunConfig()
+    if isinstance(run_config.model_provider, RoutingModelProvider):
+        return run_config
+    return dataclasses.replace(run_config, model_provider=RoutingModelProvider(run_config.model_provider, **kwargs))
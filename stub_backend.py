@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import struct
+from collections.abc import AsyncIterator
+
+from agents import Model, ModelProvider, ModelResponse, Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+from planning import WORDS_PER_MINUTE, allocate_plan
+from text_utils import count_words
+
+# Prompt fields the manager uses to size each agent's output
+_WORD_TARGETS = [
+    re.compile(r"Word Limit: (\d+)"),
+    re.compile(r"Extra Words: (\d+)"),
+    re.compile(r"Target Word Count: (\d+)"),
+]
+_LOCATION = re.compile(r"Location: ([^|\n]+)")
+_INTERESTS = re.compile(r"(?:Selected )?Interests: ([^|\n]+)")
+_DURATION = re.compile(r"Duration: ([\d.]+) minutes")
+
+# One MPEG-1 Layer III frame, 32 kbit/s mono at 44.1 kHz: 104 bytes holding 1152 samples.
+# All-zero side information and main data decode to silence.
+_SILENT_FRAME = bytes([0xFF, 0xFB, 0x10, 0xC0]) + bytes(100)
+_FRAME_SECONDS = 1152 / 44100
+# One 20 ms CELT fullband mono Opus packet that decodes to silence, and the Ogg layout around it
+_SILENT_OPUS_PACKET = bytes([0xF8, 0xFF, 0xFE])
+_OPUS_PACKET_SAMPLES = 960
+_OPUS_PRE_SKIP = 312
+_OPUS_PACKETS_PER_PAGE = 50
+
+
+def _input_text(input) -> str:
+    if isinstance(input, str):
+        return input
+    parts = []
+    for item in input:
+        content = item.get("content") if isinstance(item, dict) else None
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(part.get("text", "") for part in content if isinstance(part, dict))
+    return "\n".join(parts)
+
+
+# Filler vocabulary; sentences draw several slots each so they rarely look like repeats to compaction's dedupe
+_PLACES = [
+    "gate", "courtyard", "market", "mosque", "garden", "museum", "bazaar", "wall", "tower", "square",
+    "fountain", "library", "harbour", "bridge", "palace", "chapel", "terrace", "arcade", "cistern", "bathhouse",
+]
+_ADJECTIVES = [
+    "weathered", "restored", "forgotten", "crowded", "quiet", "ornate", "ancient", "narrow",
+    "sunlit", "vaulted", "painted", "humble", "grand", "hidden", "tiled", "crumbling",
+]
+_VERBS = ["recalls", "frames", "overlooks", "shelters", "echoes", "guards", "hides", "faces", "honours", "outlasts"]
+_PEOPLE = [
+    "merchants", "masons", "pilgrims", "poets", "children", "sailors", "scholars", "musicians",
+    "bakers", "travellers", "weavers", "monks", "soldiers", "painters", "tailors", "boatmen",
+]
+_ACTIVITIES = [
+    "trading spices", "carving marble", "resting", "reciting verses", "chasing pigeons", "mending nets",
+    "copying manuscripts", "tuning lutes", "selling bread", "swapping stories", "dyeing cloth", "ringing bells",
+    "haggling", "feasting", "praying", "dancing",
+]
+_ERAS = [
+    "medieval", "imperial", "ottoman", "byzantine", "victorian", "republican", "wartime", "colonial",
+    "baroque", "renaissance", "modern", "ancient",
+]
+_TEMPLATES = [
+    "The {adjective} {place} {verb} the {other}, where {people} gathered {activity} in {era} times.",
+    "In {era} {location}, {people} filled the {adjective} {place}, {activity} by the {other}.",
+    "Look up: the {adjective} {place} {verb} a {other} once busy with {people} {activity}.",
+    "Locals say the {place} {verb} {era} {people} {activity} near the {adjective} {other}.",
+    "Past the {adjective} {other} you may find {people} {activity} beside a {era} {place}.",
+]
+
+
+def synthetic_text(location: str, words: int, seed: int = 0, variant: str = "") -> str:
+    """
+    Deterministic filler prose of roughly ``words`` words, split into short paragraphs.
+    ``variant`` (e.g. the prompt) gives each section its own wording.
+    """
+    rng = random.Random(f"{location}:{seed}:{variant}")
+    sentences, total = [], 0
+    while total < words:
+        sentence = rng.choice(_TEMPLATES).format(
+            place=rng.choice(_PLACES),
+            other=rng.choice(_PLACES),
+            adjective=rng.choice(_ADJECTIVES),
+            verb=rng.choice(_VERBS),
+            people=rng.choice(_PEOPLE),
+            activity=rng.choice(_ACTIVITIES),
+            era=rng.choice(_ERAS),
+            location=location,
+        )
+        sentences.append(sentence)
+        total += len(sentence.split())
+    paragraphs = [" ".join(sentences[i:i + 4]) for i in range(0, len(sentences), 4)]
+    return "\n\n".join(paragraphs)
+
+
+class StubModel(Model):
+    """
+    Offline stand-in for an OpenAI model. It ignores tools and returns canned output that
+    matches the agent's output schema, sized from the word limit in the prompt, after a
+    configurable synthetic latency.
+    """
+
+    def __init__(self, model_name: str | None, latency: float, jitter: float, rng: random.Random, seed: int) -> None:
+        self.model_name = model_name or "stub"
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = rng
+        self.seed = seed
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    def _output(self, prompt: str, output_schema) -> str:
+        location_match = _LOCATION.search(prompt)
+        location = location_match.group(1).strip() if location_match else "the city"
+        words = 120
+        for pattern in _WORD_TARGETS:
+            match = pattern.search(prompt)
+            if match:
+                words = int(match.group(1))
+                break
+
+        if output_schema is None or output_schema.is_plain_text():
+            return synthetic_text(location, words, self.seed, prompt)
+
+        schema = output_schema.json_schema()
+        if schema.get("title") == "Planner":
+            interests_match = _INTERESTS.search(prompt)
+            duration_match = _DURATION.search(prompt)
+            interests = interests_match.group(1).split(",") if interests_match else []
+            duration = float(duration_match.group(1)) if duration_match else words / WORDS_PER_MINUTE
+            return allocate_plan([interest.strip() for interest in interests], duration).model_dump_json()
+
+        data = {}
+        for name, prop in schema.get("properties", {}).items():
+            if prop.get("type") == "string":
+                data[name] = synthetic_text(location, words, self.seed, prompt).replace("\n\n", " ")
+            elif prop.get("type") == "array":
+                data[name] = [synthetic_text(location, 20, self.seed + i, prompt) for i in range(4)]
+            elif prop.get("type") in ("number", "integer"):
+                data[name] = 0
+        return json.dumps(data)
+
+    def _response(self, text: str, prompt: str) -> tuple[ResponseOutputMessage, Usage]:
+        message = ResponseOutputMessage(
+            id="msg_stub",
+            content=[ResponseOutputText(text=text, type="output_text", annotations=[])],
+            role="assistant",
+            status="completed",
+            type="message",
+        )
+        # Roughly 4 characters per token, close enough for load and cost modelling
+        input_tokens = len(prompt) // 4
+        output_tokens = len(text) // 4
+        usage = Usage(
+            requests=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+        )
+        return message, usage
+
+    async def get_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, *args, **kwargs
+    ) -> ModelResponse:
+        prompt = _input_text(input)
+        await asyncio.sleep(self._delay())
+        message, usage = self._response(self._output(prompt, output_schema), prompt)
+        return ModelResponse(output=[message], usage=usage, referenceable_id=None)
+
+    async def stream_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, *args, **kwargs
+    ) -> AsyncIterator:
+        prompt = _input_text(input)
+        text = self._output(prompt, output_schema)
+        await asyncio.sleep(self._delay())
+        words = re.split(r"(\s+)", text)
+        step = 16
+        for i in range(0, len(words), step):
+            # Spread the latency again over the body so streaming consumers see a gradual arrival
+            await asyncio.sleep(self._delay() / max(1, len(words) // step))
+            yield ResponseTextDeltaEvent(
+                content_index=0,
+                delta="".join(words[i:i + step]),
+                item_id="msg_stub",
+                output_index=0,
+                type="response.output_text.delta",
+            )
+        message, usage = self._response(text, prompt)
+        yield ResponseCompletedEvent(
+            response=Response(
+                id="resp_stub",
+                created_at=0,
+                model=self.model_name,
+                object="response",
+                output=[message],
+                parallel_tool_calls=False,
+                tool_choice="auto",
+                tools=[],
+                usage=ResponseUsage(
+                    input_tokens=usage.input_tokens,
+                    input_tokens_details=InputTokensDetails(cached_tokens=0),
+                    output_tokens=usage.output_tokens,
+                    output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+                    total_tokens=usage.total_tokens,
+                ),
+            ),
+            type="response.completed",
+        )
+
+
+class StubModelProvider(ModelProvider):
+    """Resolves every model name to a StubModel; ``latency`` may be a number or a {model_name: seconds} map."""
+
+    def __init__(self, latency: float | dict = 0.2, jitter: float = 0.0, seed: int = 0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        # One generator for the provider so jitter varies from call to call but replays exactly
+        self.rng = random.Random(seed)
+
+    def get_model(self, model_name: str | None) -> Model:
+        latency = self.latency.get(model_name, 0.2) if isinstance(self.latency, dict) else self.latency
+        return StubModel(model_name, latency, self.jitter, self.rng, self.seed)
+
+
+def silent_mp3(seconds: float) -> bytes:
+    """A valid MP3 stream of ``seconds`` of silence, built from repeated silent frames."""
+    return _SILENT_FRAME * max(1, round(seconds / _FRAME_SECONDS))
+
+
+def _ogg_crc(data: bytes) -> int:
+    # CRC-32 as Ogg defines it: polynomial 0x04C11DB7, not reflected, no final XOR
+    crc = 0
+    for byte in data:
+        crc ^= byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+            crc &= 0xFFFFFFFF
+    return crc
+
+
+def _ogg_page(packets: list[bytes], granule: int, sequence: int, header_type: int) -> bytes:
+    lacing = b"".join(bytes([255] * (len(packet) // 255) + [len(packet) % 255]) for packet in packets)
+    header = b"OggS" + struct.pack(
+        "<BBqIIIB", 0, header_type, granule, 1, sequence, 0, len(lacing)
+    ) + lacing
+    page = header + b"".join(packets)
+    return page[:22] + struct.pack("<I", _ogg_crc(page)) + page[26:]
+
+
+def silent_opus(seconds: float) -> bytes:
+    """A valid Ogg Opus stream of ``seconds`` of silence, matching the speech API's "opus" format."""
+    head = b"OpusHead" + struct.pack("<BBHIhB", 1, 1, _OPUS_PRE_SKIP, 24000, 0, 0)
+    vendor = b"sonicguide-stub"
+    tags = b"OpusTags" + struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", 0)
+    pages = [_ogg_page([head], 0, 0, 0x02), _ogg_page([tags], 0, 1, 0x00)]
+
+    count = max(1, round(seconds * 48000 / _OPUS_PACKET_SAMPLES))
+    for start in range(0, count, _OPUS_PACKETS_PER_PAGE):
+        packets = min(_OPUS_PACKETS_PER_PAGE, count - start)
+        granule = _OPUS_PRE_SKIP + (start + packets) * _OPUS_PACKET_SAMPLES
+        last = start + packets >= count
+        pages.append(_ogg_page([_SILENT_OPUS_PACKET] * packets, granule, len(pages), 0x04 if last else 0x00))
+    return b"".join(pages)
+
+
+# Speech response formats the stub can produce
+_SILENT_AUDIO = {"mp3": silent_mp3, "opus": silent_opus}
+
+
+class _StubSpeechResponse:
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+
+class _StubSpeech:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def create(self, model: str, voice: str, input: str, response_format: str = "mp3", **kwargs):
+        if response_format not in _SILENT_AUDIO:
+            raise ValueError(f"Stub speech cannot produce {response_format!r}; supported: {tuple(_SILENT_AUDIO)}")
+        await asyncio.sleep(self.latency)
+        # As long as the text would take to read aloud, so downstream sizes and durations are realistic
+        return _StubSpeechResponse(_SILENT_AUDIO[response_format](count_words(input) * 60 / WORDS_PER_MINUTE))
+
+
+class _StubAudio:
+    def __init__(self, latency: float) -> None:
+        self.speech = _StubSpeech(latency)
+
+
+class StubSpeechClient:
+    """Stands in for ``AsyncOpenAI`` in TTSPipeline: ``audio.speech.create`` returns silent MP3 or Opus after ``latency``."""
+
+    def __init__(self, latency: float = 0.2) -> None:
+        self.audio = _StubAudio(latency)
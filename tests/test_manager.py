@@ -0,0 +1,57 @@
+import asyncio
+
+from agents import ModelProvider, RunConfig
+
+from coalescing import SingleFlight
+from manager import TourManager
+from printer import NullPrinter
+from stub_backend import StubModelProvider
+
+
+class SlowSearchProvider(ModelProvider):
+    """Stub models where the shared web search takes ``search_latency`` seconds."""
+
+    def __init__(self, search_latency: float) -> None:
+        self.stub = StubModelProvider(latency=0.01)
+        self.search_latency = search_latency
+
+    def get_model(self, model_name):
+        model = self.stub.get_model(model_name)
+        get_response = model.get_response
+        search_latency = self.search_latency
+
+        async def slow_search(system_instructions, input, model_settings, tools, output_schema, *args, **kwargs):
+            if output_schema is not None and output_schema.output_type_name() == "LocationBrief":
+                await asyncio.sleep(search_latency)
+            return await get_response(system_instructions, input, model_settings, tools, output_schema, *args, **kwargs)
+
+        model.get_response = slow_search
+        return model
+
+
+def make_manager(coalescer: SingleFlight) -> TourManager:
+    return TourManager(
+        run_config=RunConfig(model_provider=SlowSearchProvider(0.3), tracing_disabled=True),
+        printer=NullPrinter(),
+        coalescer=coalescer,
+        plan_mode="local",
+        prefetch_search=True,
+        hedge=False,
+    )
+
+
+def test_cancelled_tour_does_not_cancel_shared_research():
+    async def scenario():
+        coalescer = SingleFlight()
+        first = asyncio.create_task(make_manager(coalescer).run("Istanbul", ["History", "Culture"], "10"))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(make_manager(coalescer).run("Istanbul", ["History"], "5"))
+        await asyncio.sleep(0.05)
+        # The second tour is now waiting on history research started by the first
+        assert coalescer.get_stats().followers >= 1
+        first.cancel()
+        tour = await second
+        assert first.cancelled()
+        return tour
+
+    assert asyncio.run(scenario())
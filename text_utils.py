@@ -0,0 +1,82 @@
+import re
+
+# The whitespace after the punctuation, so a closing quote or bracket stays with its sentence
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|(?<=[.!?…][\"')\]])\s+")
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences on terminal punctuation followed by whitespace."""
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> list[str]:
+    # A single run-on sentence larger than the limit is broken at word boundaries
+    pieces, current = [], ""
+    for word in sentence.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text: str, max_chars: int, first_chunk_chars: int | None = None) -> list[str]:
+    """
+    Pack whole sentences into chunks of at most ``max_chars`` characters.
+    ``first_chunk_chars`` keeps the opening chunk short so it can be synthesized quickly.
+    """
+    chunks: list[str] = []
+    current = ""
+    for sentence in split_sentences(text):
+        limit = first_chunk_chars if first_chunk_chars and not chunks else max_chars
+        for piece in _split_long_sentence(sentence, max_chars) if len(sentence) > max_chars else [sentence]:
+            if current and len(current) + 1 + len(piece) > limit:
+                chunks.append(current)
+                current = piece
+                limit = max_chars
+            else:
+                current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def trim_to_words(text: str, max_words: int) -> str:
+    """
+    Drop trailing sentences until the text fits in ``max_words``, keeping paragraph breaks
+    and cutting mid-sentence only as a last resort.
+    """
+    if count_words(text) <= max_words:
+        return text
+    paragraphs, total, full = [], 0, False
+    for paragraph in text.split("\n\n"):
+        kept = []
+        for sentence in split_sentences(paragraph):
+            words = count_words(sentence)
+            if total + words > max_words:
+                full = True
+                break
+            kept.append(sentence)
+            total += words
+        if kept:
+            paragraphs.append(" ".join(kept))
+        if full:
+            break
+    if not paragraphs:
+        return " ".join(text.split()[:max_words])
+    return "\n\n".join(paragraphs)
+
+
+def trim_body_to_words(text: str, max_words: int) -> str:
+    """Like ``trim_to_words`` but keeps the closing paragraph (e.g. a tour's conclusion) intact."""
+    if count_words(text) <= max_words or "\n\n" not in text.strip():
+        return trim_to_words(text, max_words)
+    body, ending = text.strip().rsplit("\n\n", 1)
+    return "{}\n\n{}".format(trim_to_words(body, max(1, max_words - count_words(ending))), ending)
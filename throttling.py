@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import AsyncIterator
+
+import openai
+from agents import Model, ModelProvider, ModelResponse, OpenAIProvider
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+
+# Errors worth retrying: throttling, transient network failures and 5xx responses
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+
+def retry_delay(error: Exception, attempt: int, base_delay: float, max_delay: float) -> float:
+    """Honour the server's Retry-After header when present, otherwise back off exponentially with jitter."""
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        try:
+            return min(max_delay, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+    return min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+async def call_with_retry(
+    func,
+    *args,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base_delay: float = DEFAULT_BASE_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    **kwargs,
+):
+    for attempt in range(max_retries + 1):
+        try:
+            return await func(*args, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(retry_delay(e, attempt, base_delay, max_delay))
+
+
+class ThrottledModel(Model):
+    """
+    Wraps a model so every call waits on the shared global and per-model semaphores and
+    retries rate-limited or transient failures with backoff.
+    """
+
+    def __init__(self, model: Model, semaphores: list[asyncio.Semaphore], max_retries: int) -> None:
+        self.model = model
+        self.semaphores = semaphores
+        self.max_retries = max_retries
+
+    async def _acquire(self) -> None:
+        acquired = []
+        try:
+            for semaphore in self.semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            # Cancelled (timeout, losing hedge) while waiting: hand back the permits already taken
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            raise
+
+    def _release(self) -> None:
+        for semaphore in reversed(self.semaphores):
+            semaphore.release()
+
+    async def _get_response_once(self, *args, **kwargs) -> ModelResponse:
+        await self._acquire()
+        try:
+            return await self.model.get_response(*args, **kwargs)
+        finally:
+            self._release()
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        return await call_with_retry(self._get_response_once, *args, max_retries=self.max_retries, **kwargs)
+
+    async def stream_response(self, *args, **kwargs) -> AsyncIterator:
+        # Streams are not retried: events may already have reached the caller
+        await self._acquire()
+        try:
+            async for event in self.model.stream_response(*args, **kwargs):
+                yield event
+        finally:
+            self._release()
+
+
+class ThrottledModelProvider(ModelProvider):
+    """
+    Model provider that bounds concurrent calls globally and per model name.
+    ``model_limits`` maps a model name (e.g. "gpt-4o") to its own concurrency limit.
+    """
+
+    def __init__(
+        self,
+        provider: ModelProvider | None = None,
+        max_concurrency: int | None = None,
+        model_limits: dict | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> None:
+        self.provider = provider or OpenAIProvider()
+        self.global_semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.model_semaphores = {
+            name: asyncio.Semaphore(limit) for name, limit in (model_limits or {}).items()
+        }
+        self.max_retries = max_retries
+
+    def get_model(self, model_name: str | None) -> Model:
+        semaphores = []
+        if model_name in self.model_semaphores:
+            semaphores.append(self.model_semaphores[model_name])
+        if self.global_semaphore is not None:
+            semaphores.append(self.global_semaphore)
+        return ThrottledModel(self.provider.get_model(model_name), semaphores, self.max_retries)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import AsyncIterator
+
+from audio_cache import AudioStore
+from audio_profiles import AudioProfile, get_profile, write_audio
+from backends import get_speech_client
+from concurrency import run_in_order
+from metrics import timed_stage
+from text_utils import chunk_text
+
+TTS_MODEL = "tts-1"
+TTS_VOICE = "nova"
+
+# The speech endpoint rejects inputs over 4096 characters
+MAX_CHUNK_CHARS = 4000
+# A short opening chunk gets the first audio back in a few seconds
+FIRST_CHUNK_CHARS = 400
+DEFAULT_TTS_CONCURRENCY = 4
+
+
+class TTSPipeline:
+    """
+    Splits a tour at sentence boundaries and synthesizes the chunks in parallel,
+    yielding the audio segments in order as soon as each one is ready.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = TTS_MODEL,
+        voice: str = TTS_VOICE,
+        max_concurrency: int = DEFAULT_TTS_CONCURRENCY,
+        max_retries: int = 2,
+        store: AudioStore | None = None,
+        client=None,
+        profile: AudioProfile | str | None = None,
+    ) -> None:
+        # Anything with ``audio.speech.create``; defaults to the selected backend's client
+        self.client = client or get_speech_client(api_key, max_retries)
+        self.model = model
+        self.voice = voice
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        # Optional content-addressed segment cache; hits skip the speech call
+        self.store = store
+        # Codec requested per segment and the encoding of assembled tours (see audio_profiles.py)
+        self.profile = get_profile(profile)
+
+    async def synthesize_chunk(self, text: str, language: str = "en") -> bytes:
+        key = None
+        if self.store is not None:
+            key = AudioStore.segment_key(text, self.voice, self.model, language, self.profile.response_format)
+            cached = await asyncio.to_thread(self.store.get, key, self.profile.extension)
+            if cached is not None:
+                return cached
+
+        async with self.semaphore:
+            with timed_stage("TTS synthesis") as stage:
+                response = await self.client.audio.speech.create(
+                    model=self.model,
+                    voice=self.voice,
+                    input=text,
+                    response_format=self.profile.response_format,
+                )
+                stage.add_characters(self.model, len(text))
+        if key is not None:
+            await asyncio.to_thread(self.store.put, key, response.content, self.profile.extension)
+        return response.content
+
+    async def stream(self, text: str, language: str = "en") -> AsyncIterator[bytes]:
+        async def chunks():
+            for chunk in chunk_text(text, MAX_CHUNK_CHARS, first_chunk_chars=FIRST_CHUNK_CHARS):
+                yield chunk
+
+        async for segment in self.stream_paragraphs(chunks(), language):
+            yield segment
+
+    async def stream_paragraphs(
+        self, paragraphs: AsyncIterator[str], language: str = "en"
+    ) -> AsyncIterator[bytes]:
+        """
+        Start synthesizing each paragraph as soon as ``paragraphs`` produces it, so audio for
+        the opening can be ready while the rest of the tour is still being written.
+        """
+        async def synthesized_chunks():
+            first_chunk_chars = FIRST_CHUNK_CHARS
+            async for paragraph in paragraphs:
+                with timed_stage("TTS chunking"):
+                    chunks = chunk_text(paragraph, MAX_CHUNK_CHARS, first_chunk_chars=first_chunk_chars)
+                for chunk in chunks:
+                    first_chunk_chars = None
+                    # The text is already in ``language``; it only keys the segment cache
+                    yield self.synthesize_chunk(chunk, language)
+
+        async for segment in run_in_order(synthesized_chunks()):
+            yield segment
+
+    async def synthesize(self, text: str, language: str = "en") -> bytes:
+        """Synthesize the whole tour and return the concatenated segment bytes (not re-encoded)."""
+        segments = [segment async for segment in self.stream(text, language)]
+        return b"".join(segments)
+
+    async def synthesize_to_store(self, text: str, language: str = "en") -> str:
+        """Synthesize the tour through the segment cache and return the path of the assembled file."""
+        if self.store is None:
+            raise ValueError("synthesize_to_store needs a TTSPipeline created with an AudioStore")
+        segments = [segment async for segment in self.stream(text, language)]
+        return await asyncio.to_thread(self.store.assemble, segments, self.profile)
+
+    async def synthesize_to_file(self, text: str, path: str, language: str = "en") -> str:
+        """Synthesize the tour into ``path`` with the profile's extension and encoding; returns the path."""
+        path = f"{os.path.splitext(path)[0]}.{self.profile.extension}"
+        segments = [segment async for segment in self.stream(text, language)]
+        await asyncio.to_thread(write_audio, path, segments, self.profile)
+        return path
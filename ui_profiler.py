@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from metrics import percentile
+
+# SONICGUIDE_PROFILE_UI=1 shows rerun timings in the app sidebar
+PROFILE_UI = os.environ.get("SONICGUIDE_PROFILE_UI", "") not in ("", "0")
+DEFAULT_WINDOW = 200
+# What the Streamlit script imports on page load, and what it defers until a tour is generated
+APP_MODULES = ["streamlit", "interests", "research_cache", "audio_server", "jobs", "locations"]
+GENERATION_MODULES = ["manager", "tts", "clients", "backends", "agents", "openai"]
+
+
+@dataclass
+class RerunTimer:
+    """Wall-clock checkpoints within one execution of the Streamlit script."""
+
+    started: float = field(default_factory=time.perf_counter)
+    marks: list[tuple[str, float]] = field(default_factory=list)
+
+    def mark(self, name: str) -> None:
+        self.marks.append((name, time.perf_counter() - self.started))
+
+
+class RerunProfiler:
+    """Rolling durations of script reruns across every session in the process."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        self._durations: deque[float] = deque(maxlen=window)
+        self._last: list[tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> RerunTimer:
+        return RerunTimer()
+
+    def finish(self, timer: RerunTimer) -> None:
+        elapsed = time.perf_counter() - timer.started
+        with self._lock:
+            self._durations.append(elapsed)
+            self._last = list(timer.marks)
+
+    def summary(self) -> dict:
+        with self._lock:
+            durations = list(self._durations)
+            last = list(self._last)
+        return {
+            "reruns": len(durations),
+            "last_ms": round(durations[-1] * 1000, 1) if durations else 0.0,
+            "p50_ms": round(percentile(durations, 50) * 1000, 1),
+            "p95_ms": round(percentile(durations, 95) * 1000, 1),
+            "checkpoints_ms": {name: round(seconds * 1000, 1) for name, seconds in last},
+        }
+
+
+_profiler: RerunProfiler | None = None
+_profiler_lock = threading.Lock()
+
+
+def get_rerun_profiler() -> RerunProfiler:
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = RerunProfiler()
+        return _profiler
+
+
+def import_time(module: str, python: str = sys.executable) -> float:
+    """Cold import time of ``module`` in milliseconds, measured in a fresh interpreter with -X importtime."""
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {completed.stderr.strip().splitlines()[-1:]}")
+    # Lines look like "import time:  self [us] | cumulative | name"; the top-level module comes last
+    for line in reversed(completed.stderr.splitlines()):
+        _, _, timings = line.partition("import time:")
+        parts = [part.strip() for part in timings.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    return 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold import times of the SonicGuide app and generation modules")
+    parser.add_argument("modules", nargs="*", help="Modules to time (default: app and generation modules)")
+    args = parser.parse_args()
+
+    groups = {"custom": args.modules} if args.modules else {"page load": APP_MODULES, "generation": GENERATION_MODULES}
+    for group, modules in groups.items():
+        print(f"{group}:")
+        for module in modules:
+            print(f"  {module:<16} {import_time(module):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()